@@ -3,21 +3,27 @@ import threading
 import time
 from typing import Callable, Optional
 
+from arduino.protocol import Detected, EnrollFail, EnrollOK, EnrollStep, ProtocolParser, SensorError
+
 
 class ArduinoComm:
+    READ_TIMEOUT = 0.5  # Upper bound on how long a blocking read waits
+
     def __init__(self, port: str = "COM4", baudrate: int = 9600):
         self.port = port
         self.baudrate = baudrate
         self.serial_conn: Optional[serial.Serial] = None
         self.is_connected = False
         self.detection_callback: Optional[Callable] = None
+        self.enrollment_callback: Optional[Callable] = None
         self.listening = False
         self.listen_thread: Optional[threading.Thread] = None
+        self.parser = ProtocolParser()
 
     def connect(self) -> bool:
         """Connect to Arduino"""
         try:
-            self.serial_conn = serial.Serial(self.port, self.baudrate, timeout=1)
+            self.serial_conn = serial.Serial(self.port, self.baudrate, timeout=self.READ_TIMEOUT)
             time.sleep(2)  # Wait for Arduino to initialize
             self.is_connected = True
             return True
@@ -51,14 +57,30 @@ class ArduinoComm:
             self.start_listening()
 
     def start_enrollment_mode(self, fingerprint_id: int):
-        """Start fingerprint enrollment mode"""
+        """Start fingerprint enrollment mode.
+
+        Progress is reported to the enrollment callback as the sensor prints it.
+        """
+        self.parser.enroll_step = 0
         if self.send_command("e"):
+            self.start_listening()
             time.sleep(0.5)
             self.send_command(str(fingerprint_id))
 
-    def set_detection_callback(self, callback: Callable):
-        """Set callback function for detection events"""
+    def set_detection_callback(self, callback: Optional[Callable]):
+        """Set callback function for detection events; it receives the fingerprint ID"""
         self.detection_callback = callback
+        self.parser.set_callback(Detected, (lambda event: callback(event.fingerprint_id)) if callback else None)
+
+    def set_enrollment_callback(self, callback: Optional[Callable]):
+        """Set callback function for EnrollStep, EnrollOK, EnrollFail and SensorError events"""
+        self.enrollment_callback = callback
+        for event_type in (EnrollStep, EnrollOK, EnrollFail, SensorError):
+            self.parser.set_callback(event_type, callback)
+
+    def set_event_callback(self, event_type: type, callback: Optional[Callable]):
+        """Set callback function for any event type of arduino.protocol, e.g. SensorError"""
+        self.parser.set_callback(event_type, callback)
 
     def start_listening(self):
         """Start listening for Arduino messages"""
@@ -70,48 +92,41 @@ class ArduinoComm:
     def stop_listening(self):
         """Stop listening for Arduino messages"""
         self.listening = False
-        if self.listen_thread:
+
+        # Wake the listener out of its blocking read
+        if self.serial_conn and hasattr(self.serial_conn, "cancel_read"):
+            try:
+                self.serial_conn.cancel_read()
+            except Exception:
+                pass
+
+        if self.listen_thread and self.listen_thread is not threading.current_thread():
             self.listen_thread.join(timeout=1)
 
     def _listen_loop(self):
-        """Main listening loop"""
+        """Main listening loop.
+
+        Blocks in read() until bytes arrive (or the read timeout expires), then
+        hands them to the protocol parser, which dispatches every complete line.
+        """
+        self.parser.clear()
         while self.listening and self.is_connected and self.serial_conn:
             try:
-                if self.serial_conn.in_waiting > 0:
-                    line = self.serial_conn.readline().decode().strip()
-                    if line:
-                        self._process_message(line)
-                time.sleep(0.1)
+                chunk = self.serial_conn.read(max(1, self.serial_conn.in_waiting))
             except Exception as e:
                 print(f"Error in listen loop: {e}")
+                self.listening = False
                 break
 
+            if chunk:
+                self.parser.feed(chunk)
+
     def _process_message(self, message: str):
-        """Process incoming Arduino messages"""
-        print(f"Arduino: {message}")
+        """Process one incoming Arduino message"""
+        self.parser.feed_line(message.encode())
 
-        # Check for successful detection
-        if "ACCESS GRANTED - ID #" in message:
-            try:
-                # Extract ID from message like "✓ ACCESS GRANTED - ID #3 detected!"
-                parts = message.split("ID #")
-                if len(parts) > 1:
-                    id_part = parts[1].split()[0]
-                    fingerprint_id = int(id_part)
-                    if self.detection_callback:
-                        self.detection_callback(fingerprint_id)
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing fingerprint ID: {e}")
-
-        # Check for enrollment success
-        elif "Enrollment successful!" in message:
-            print("Fingerprint enrolled successfully")
-
-        # Check for enrollment failure
-        elif "Fingerprints did not match" in message:
-            print("Enrollment failed - fingerprints didn't match")
-
-    def get_available_ports(self) -> list:
+    @staticmethod
+    def get_available_ports() -> list:
         """Get list of available serial ports"""
         import serial.tools.list_ports
         ports = serial.tools.list_ports.comports()
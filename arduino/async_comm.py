@@ -0,0 +1,237 @@
+import asyncio
+import os
+from typing import Callable, Optional
+
+import serial
+
+from arduino.arduino_comm import ArduinoComm
+from arduino.protocol import ProtocolParser
+
+try:
+    import serial_asyncio  # pyserial-asyncio, optional
+except ImportError:
+    serial_asyncio = None
+
+
+class SerialReaderProtocol(asyncio.Protocol):
+    """Hands incoming serial bytes to AsyncArduinoComm"""
+
+    def __init__(self, on_data: Callable[[bytes], None], on_lost: Callable[[Optional[Exception]], None]):
+        self.on_data = on_data
+        self.on_lost = on_lost
+        self.transport: Optional[asyncio.Transport] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        self.on_data(data)
+
+    def connection_lost(self, exc):
+        self.transport = None
+        self.on_lost(exc)
+
+
+class SerialTransport(asyncio.Transport):
+    """Minimal serial transport used when pyserial-asyncio is not installed.
+
+    On POSIX the port's file descriptor is watched with loop.add_reader, so
+    idle ports cost nothing. Elsewhere (Windows) blocking reads with a short
+    timeout run in the loop's default executor.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, protocol: asyncio.Protocol, serial_conn: serial.Serial):
+        super().__init__()
+        self._loop = loop
+        self._protocol = protocol
+        self._serial = serial_conn
+        self._closing = False
+        self._reader_task: Optional[asyncio.Task] = None
+        self._watching_fd = False
+
+        if os.name == "posix":
+            self._serial.timeout = 0
+            loop.add_reader(self._serial.fileno(), self._read_ready)
+            self._watching_fd = True
+        else:
+            self._serial.timeout = ArduinoComm.READ_TIMEOUT
+            self._reader_task = loop.create_task(self._read_in_executor())
+        loop.call_soon(protocol.connection_made, self)
+
+    def _read_ready(self):
+        try:
+            data = self._serial.read(max(1, self._serial.in_waiting))
+        except Exception as e:
+            self._close(e)
+            return
+        if data:
+            self._protocol.data_received(data)
+
+    async def _read_in_executor(self):
+        # Wait for at least one byte, then take whatever else has arrived, so
+        # a line is handed over as soon as it is complete, not at the timeout
+        while not self._closing:
+            try:
+                data = await self._loop.run_in_executor(
+                    None, lambda: self._serial.read(max(1, self._serial.in_waiting)))
+            except Exception as e:
+                self._close(e)
+                return
+            if data and not self._closing:
+                self._protocol.data_received(data)
+
+    def write(self, data: bytes):
+        if self._closing:
+            return
+        try:
+            self._serial.write(data)
+        except Exception as e:
+            self._close(e)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self):
+        self._close(None)
+
+    def _close(self, exc: Optional[Exception]):
+        if self._closing:
+            return
+        self._closing = True
+        if self._watching_fd:
+            self._loop.remove_reader(self._serial.fileno())
+            self._watching_fd = False
+        if self._reader_task:
+            self._reader_task.cancel()
+        if hasattr(self._serial, "cancel_read"):
+            try:
+                self._serial.cancel_read()
+            except Exception:
+                pass
+        self._serial.close()
+        self._loop.call_soon(self._protocol.connection_lost, exc)
+
+
+async def create_serial_connection(loop: asyncio.AbstractEventLoop, protocol_factory: Callable,
+                                   port: str, baudrate: int):
+    """Open a serial port as an asyncio (transport, protocol) pair"""
+    if serial_asyncio is not None:
+        return await serial_asyncio.create_serial_connection(loop, protocol_factory, port, baudrate=baudrate)
+
+    serial_conn = await loop.run_in_executor(None, lambda: serial.Serial(port, baudrate, timeout=0))
+    protocol = protocol_factory()
+    transport = SerialTransport(loop, protocol, serial_conn)
+    return transport, protocol
+
+
+class AsyncArduinoComm:
+    """asyncio version of ArduinoComm.
+
+    Any number of instances can share one event loop: reads are driven by
+    the loop instead of a thread per port, and the Arduino reset wait in
+    connect() and the pause in start_enrollment_mode() are asyncio sleeps.
+    connect(), disconnect() and start_enrollment_mode() are coroutines;
+    send_command() and start_detection_mode() may be called from any thread.
+    Detection and enrollment callbacks run on the event loop thread.
+    """
+
+    CONNECT_DELAY = 2.0  # Arduino resets when the port opens
+    ENROLL_COMMAND_DELAY = 0.5
+
+    def __init__(self, port: str = "COM4", baudrate: int = 9600):
+        self.port = port
+        self.baudrate = baudrate
+        self.is_connected = False
+        self.detection_callback: Optional[Callable] = None
+        self.enrollment_callback: Optional[Callable] = None
+        self.listening = False
+        self.parser = ProtocolParser()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[asyncio.Transport] = None
+
+    # Callback registration is shared with the threaded implementation
+    set_detection_callback = ArduinoComm.set_detection_callback
+    set_enrollment_callback = ArduinoComm.set_enrollment_callback
+    set_event_callback = ArduinoComm.set_event_callback
+    _process_message = ArduinoComm._process_message
+
+    async def connect(self) -> bool:
+        """Connect to Arduino"""
+        self.loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await create_serial_connection(
+                self.loop, lambda: SerialReaderProtocol(self._on_data, self._on_connection_lost),
+                self.port, self.baudrate)
+            await asyncio.sleep(self.CONNECT_DELAY)  # Wait for Arduino to initialize
+            self.is_connected = self._transport is not None
+            return self.is_connected
+        except Exception as e:
+            print(f"Failed to connect to Arduino: {e}")
+            self.is_connected = False
+            return False
+
+    async def disconnect(self):
+        """Disconnect from Arduino"""
+        self.listening = False
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        self.is_connected = False
+
+    def send_command(self, command: str) -> bool:
+        """Send command to Arduino without waiting for the write"""
+        if not self.is_connected or not self._transport:
+            return False
+
+        data = f"{command}\n".encode()
+        if self._on_loop_thread():
+            self._transport.write(data)
+        else:
+            self.loop.call_soon_threadsafe(self._write, data)
+        return True
+
+    def start_detection_mode(self):
+        """Start fingerprint detection mode"""
+        if self.send_command("d"):
+            self.start_listening()
+
+    async def start_enrollment_mode(self, fingerprint_id: int):
+        """Start fingerprint enrollment mode, reporting progress to the enrollment callback"""
+        self.parser.enroll_step = 0
+        if self.send_command("e"):
+            self.start_listening()
+            await asyncio.sleep(self.ENROLL_COMMAND_DELAY)
+            self.send_command(str(fingerprint_id))
+
+    def start_listening(self):
+        """Start handling Arduino messages"""
+        if self.is_connected and not self.listening:
+            self.parser.clear()
+            self.listening = True
+
+    def stop_listening(self):
+        """Stop handling Arduino messages"""
+        self.listening = False
+
+    def _write(self, data: bytes):
+        if self._transport:
+            self._transport.write(data)
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _on_data(self, data: bytes):
+        if self.listening:
+            self.parser.feed(data)
+
+    def _on_connection_lost(self, exc: Optional[Exception]):
+        if exc:
+            print(f"Error in listen loop: {exc}")
+        self.listening = False
+        self.is_connected = False
+        self._transport = None
+
+    get_available_ports = staticmethod(ArduinoComm.get_available_ports)
@@ -0,0 +1,186 @@
+"""Line protocol of the Arduino attendance sketch.
+
+The sketch prints one message per line. ProtocolParser turns the raw bytes
+read from the serial port into the typed events below and hands each event
+to the callback registered for its type:
+
+    parser = ProtocolParser()
+    parser.set_callback(Detected, lambda event: print(event.fingerprint_id))
+    parser.feed(serial_conn.read(64))
+
+Lines are matched against LINE_PATTERNS, compiled once at import, with a
+dictionary lookup first for lines the sketch always prints verbatim. Text
+is only decoded for events that have a callback, so lines nobody listens
+for cost little more than the match.
+"""
+import re
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+# Lines printed by the sketch. The simulator writes the same lines.
+DETECTION_LINE = "✓ ACCESS GRANTED - ID #{id} detected!"
+NO_MATCH_LINE = "✗ Did not find a match"
+ENROLL_START_LINE = "Enrolling ID #{id}"
+ENROLL_SUCCESS_LINE = "Enrollment successful!"
+ENROLL_FAILURE_LINE = "Fingerprints did not match"
+
+# Progress lines printed by the sketch while enrolling, in order
+ENROLL_STEP_LINES = (
+    "Place finger on sensor...",
+    "Image taken",
+    "Remove finger",
+    "Place same finger again...",
+    "Image taken",
+    "Creating model...",
+)
+
+MAX_LINE_LENGTH = 4096  # Discard partial lines longer than this
+
+
+class Detected(NamedTuple):
+    """A finger matched the stored fingerprint ``fingerprint_id``"""
+    fingerprint_id: int
+
+
+class NoMatch(NamedTuple):
+    """A finger was read but matched no stored fingerprint"""
+    message: str
+
+
+class EnrollStart(NamedTuple):
+    """The sensor started enrolling ``fingerprint_id``"""
+    fingerprint_id: int
+
+
+class EnrollStep(NamedTuple):
+    """The sensor reached progress line ``step`` (1-based) of ``total``"""
+    step: int
+    total: int
+    message: str
+
+
+class EnrollOK(NamedTuple):
+    """The fingerprint model was stored"""
+    message: str
+
+
+class EnrollFail(NamedTuple):
+    """Enrollment failed, e.g. because the two scans did not match"""
+    message: str
+
+
+class SensorError(NamedTuple):
+    """The sketch reported a sensor fault, e.g. "Imaging error\""""
+    message: str
+
+
+class UnknownLine(NamedTuple):
+    """Any other line, such as menu text"""
+    message: str
+
+
+# Event type for each kind of line, tried in order; the first match wins.
+# Detected and EnrollStart capture the fingerprint ID as group 1.
+LINE_PATTERNS = (
+    (Detected, re.compile(rb"ACCESS GRANTED - ID #(\d+)")),
+    (NoMatch, re.compile(rb"Did not find a match")),
+    (EnrollStart, re.compile(rb"^Enrolling ID #(\d+)")),
+    (EnrollStep, re.compile(rb"^(?:" + rb"|".join(
+        re.escape(line.encode()) for line in dict.fromkeys(ENROLL_STEP_LINES)) + rb")")),
+    (EnrollOK, re.compile(re.escape(ENROLL_SUCCESS_LINE.encode()))),
+    (EnrollFail, re.compile(re.escape(ENROLL_FAILURE_LINE.encode()))),
+    (SensorError, re.compile(rb"[Ee]rror|ERROR|Did not find fingerprint sensor")),
+)
+
+# Lines printed verbatim, looked up before trying the patterns
+EXACT_LINES = {
+    NO_MATCH_LINE.encode(): NoMatch,
+    ENROLL_SUCCESS_LINE.encode(): EnrollOK,
+    ENROLL_FAILURE_LINE.encode(): EnrollFail,
+    **{line.encode(): EnrollStep for line in ENROLL_STEP_LINES},
+}
+
+
+class ProtocolParser:
+    """Parses the sketch's output and dispatches events by type.
+
+    Not thread-safe; each serial port gets its own parser, fed from the one
+    thread (or event loop) that reads the port. Callbacks run on that thread.
+    """
+
+    def __init__(self):
+        self._callbacks: Dict[type, Callable] = {}
+        self._pending = b""  # Partial line from the previous read
+        self.enroll_step = 0  # Progress lines seen in the current enrollment
+
+    def set_callback(self, event_type: type, callback: Optional[Callable]):
+        """Call ``callback(event)`` for every event of ``event_type``; None removes it"""
+        if callback is None:
+            self._callbacks.pop(event_type, None)
+        else:
+            self._callbacks[event_type] = callback
+
+    def clear(self):
+        """Forget a partial line, e.g. when listening restarts"""
+        self._pending = b""
+
+    def feed(self, data: bytes):
+        """Dispatch every complete line in ``data``; a trailing partial line is kept"""
+        if b"\n" not in data:
+            self._pending += data
+            if len(self._pending) > MAX_LINE_LENGTH:
+                self._pending = b""
+            return
+
+        lines = (self._pending + data).split(b"\n")
+        self._pending = lines.pop()
+        if len(self._pending) > MAX_LINE_LENGTH:
+            self._pending = b""
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_line(self, line: bytes):
+        """Dispatch one line to the callback for its event type, if there is one"""
+        event_type, match, line = self._classify(line)
+        if event_type is not None:
+            callback = self._callbacks.get(event_type)
+            if callback is not None:
+                callback(self._build(event_type, match, line))
+
+    def parse_line(self, line: bytes):
+        """Event for one line regardless of callbacks, or None for a blank line"""
+        event_type, match, line = self._classify(line)
+        if event_type is None:
+            return None
+        return self._build(event_type, match, line)
+
+    def _classify(self, line: bytes):
+        """(event type, match, stripped line), keeping track of enrollment progress"""
+        line = line.strip()
+        if not line:
+            return None, None, line
+
+        match = None
+        event_type = EXACT_LINES.get(line)
+        if event_type is None:
+            for candidate, pattern in LINE_PATTERNS:
+                match = pattern.search(line)
+                if match is not None:
+                    event_type = candidate
+                    break
+            else:
+                event_type = UnknownLine
+
+        if event_type is EnrollStep:
+            self.enroll_step = min(self.enroll_step + 1, len(ENROLL_STEP_LINES))
+        elif event_type is EnrollStart:
+            self.enroll_step = 0
+        return event_type, match, line
+
+    def _build(self, event_type: type, match, line: bytes):
+        if event_type is Detected or event_type is EnrollStart:
+            return event_type(int(match[1]))
+        message = line.decode(errors="replace")
+        if event_type is EnrollStep:
+            return EnrollStep(self.enroll_step, len(ENROLL_STEP_LINES), message)
+        return event_type(message)
@@ -0,0 +1,172 @@
+import fnmatch
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from arduino.arduino_comm import ArduinoComm
+
+logger = logging.getLogger(__name__)
+
+
+class SensorManager:
+    """Runs one ArduinoComm per serial port and funnels detections into one handler.
+
+    Each sensor keeps its own blocking listener thread, so an idle or slow
+    port never holds up the others. Listener threads only tag a detection
+    with its sensor ID and drop it on a shared queue; a single dispatcher
+    thread calls ``handler(sensor_id, fingerprint_id)`` for each one in
+    arrival order. Connecting (which waits for each Arduino to reset) and
+    reconnecting run on a thread pool so they happen in parallel.
+    """
+
+    def __init__(self, handler: Callable[[str, int], None], baudrate: int = 9600,
+                 max_workers: int = 8, reconnect_interval: float = 5.0, max_queue: int = 10000):
+        self.handler = handler
+        self.baudrate = baudrate
+        self.max_workers = max_workers
+        self.reconnect_interval = reconnect_interval
+
+        self.sensors: Dict[str, ArduinoComm] = {}
+        self.dropped = 0  # Detections discarded because the queue was full
+
+        self._events: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connecting = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._supervise_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def discover_ports(pattern: Optional[str] = None) -> List[str]:
+        """List serial ports, optionally filtered by a glob such as /dev/ttyACM*"""
+        ports = ArduinoComm.get_available_ports()
+        if pattern:
+            ports = [port for port in ports if fnmatch.fnmatch(port, pattern)]
+        return ports
+
+    def add_sensor(self, port: str, sensor_id: Optional[str] = None) -> str:
+        """Register a sensor; it is connected by start() or, if running, right away"""
+        sensor_id = sensor_id or port
+        comm = ArduinoComm(port=port, baudrate=self.baudrate)
+        comm.set_detection_callback(
+            lambda fingerprint_id, sensor_id=sensor_id: self._on_detection(sensor_id, fingerprint_id))
+
+        with self._lock:
+            if sensor_id in self.sensors:
+                raise ValueError(f"Sensor {sensor_id} is already registered")
+            self.sensors[sensor_id] = comm
+
+        if self._dispatch_thread and not self._stop_event.is_set():
+            self._connect_async(sensor_id)
+        return sensor_id
+
+    def remove_sensor(self, sensor_id: str):
+        """Disconnect a sensor and stop tracking it"""
+        with self._lock:
+            comm = self.sensors.pop(sensor_id, None)
+        if comm:
+            comm.disconnect()
+
+    def start(self):
+        """Connect every sensor in parallel and start dispatching detections"""
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SensorConnect")
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, name="SensorDispatch", daemon=True)
+        self._dispatch_thread.start()
+
+        for sensor_id in list(self.sensors):
+            self._connect_async(sensor_id)
+
+        self._supervise_thread = threading.Thread(target=self._supervise_loop, name="SensorSupervisor", daemon=True)
+        self._supervise_thread.start()
+
+    def stop(self):
+        """Disconnect every sensor and dispatch what is already queued"""
+        self._stop_event.set()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+        for comm in list(self.sensors.values()):
+            comm.disconnect()
+
+        if self._dispatch_thread:
+            self._events.put(None)
+            self._dispatch_thread.join(timeout=5)
+            self._dispatch_thread = None
+        if self._supervise_thread:
+            self._supervise_thread.join(timeout=5)
+            self._supervise_thread = None
+
+    def status(self) -> Dict[str, Dict]:
+        """Connection state of every sensor, keyed by sensor ID"""
+        with self._lock:
+            sensors = dict(self.sensors)
+            connecting = set(self._connecting)
+        return {
+            sensor_id: {
+                'port': comm.port,
+                'connected': comm.is_connected and comm.listening,
+                'connecting': sensor_id in connecting,
+            }
+            for sensor_id, comm in sensors.items()
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return self._events.qsize()
+
+    def _on_detection(self, sensor_id: str, fingerprint_id: int):
+        """Runs on a sensor's listener thread, so it must never block"""
+        try:
+            self._events.put_nowait((sensor_id, fingerprint_id))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("detection_dropped", extra={
+                'sensor_id': sensor_id, 'fingerprint_id': fingerprint_id, 'dropped': self.dropped})
+
+    def _dispatch_loop(self):
+        """Hand queued detections to the handler one at a time"""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            try:
+                self.handler(*event)
+            except Exception:
+                logger.exception("handler_failed", extra={'sensor_id': event[0], 'fingerprint_id': event[1]})
+
+    def _connect_async(self, sensor_id: str):
+        with self._lock:
+            if sensor_id in self._connecting or sensor_id not in self.sensors:
+                return
+            self._connecting.add(sensor_id)
+        try:
+            self._executor.submit(self._connect, sensor_id)
+        except RuntimeError:  # Executor already shut down
+            with self._lock:
+                self._connecting.discard(sensor_id)
+
+    def _connect(self, sensor_id: str):
+        """Open a sensor's port and put it into detection mode"""
+        try:
+            comm = self.sensors.get(sensor_id)
+            if comm is None or self._stop_event.is_set():
+                return
+            if comm.is_connected:
+                comm.disconnect()
+            if comm.connect():
+                comm.start_detection_mode()
+                logger.debug("sensor_connected", extra={'sensor_id': sensor_id, 'port': comm.port})
+        finally:
+            with self._lock:
+                self._connecting.discard(sensor_id)
+
+    def _supervise_loop(self):
+        """Reconnect sensors whose port failed or dropped out"""
+        while not self._stop_event.wait(self.reconnect_interval):
+            for sensor_id, state in self.status().items():
+                if not state['connected'] and not state['connecting']:
+                    self._connect_async(sensor_id)
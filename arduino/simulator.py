@@ -0,0 +1,226 @@
+"""Virtual Arduino + R307 fingerprint sensor on a pseudo-terminal.
+
+The simulator speaks the same line protocol as the attendance sketch, so
+ArduinoComm can be pointed at ``simulator.port`` instead of a real COM port.
+It answers the ``d`` (detection), ``m`` (menu) and ``e`` + ID (enrollment)
+commands and can replay scans at a configurable rate and burst size for
+load testing. POSIX only, since it relies on pseudo-terminals.
+
+Run standalone from the repository root:
+
+    python -m arduino.simulator --rate 5 --burst 3 --count 500
+"""
+import argparse
+import os
+import random
+import select
+import threading
+import time
+import tty
+from typing import Callable, Iterable, Optional
+
+from arduino.protocol import (
+    DETECTION_LINE, ENROLL_FAILURE_LINE, ENROLL_START_LINE, ENROLL_STEP_LINES, ENROLL_SUCCESS_LINE,
+    NO_MATCH_LINE
+)
+
+
+class ArduinoSimulator:
+    """Pseudo-terminal stand-in for the Arduino attendance sketch"""
+
+    def __init__(self, enroll_step_delay: float = 0.2, enroll_failure_rate: float = 0.0):
+        self.enroll_step_delay = enroll_step_delay
+        self.enroll_failure_rate = enroll_failure_rate
+
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.port = os.ttyname(self.slave_fd)
+
+        self.mode = "menu"
+        self.scans_emitted = 0
+        self.emit_callback: Optional[Callable[[int, float], None]] = None
+
+        self._awaiting_enroll_id = False
+        self._write_lock = threading.Lock()
+        self._running = False
+        self._reader_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start answering commands from the host"""
+        if self._running:
+            return
+        self._running = True
+        self._reader_thread = threading.Thread(target=self._read_commands, daemon=True)
+        self._reader_thread.start()
+
+    def stop(self):
+        """Stop the simulator and close the pseudo-terminal"""
+        self._running = False
+        if self._reader_thread:
+            self._reader_thread.join(timeout=1)
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def write_line(self, line: str):
+        """Send one line to the host, terminated like Serial.println"""
+        with self._write_lock:
+            os.write(self.master_fd, f"{line}\r\n".encode())
+
+    def wait_for_mode(self, mode: str, timeout: float = 10.0) -> bool:
+        """Wait until the host has switched the sketch into ``mode``"""
+        deadline = time.monotonic() + timeout
+        while self.mode != mode:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def scan(self, fingerprint_id: Optional[int]) -> bool:
+        """Simulate a finger on the sensor; None is an unknown finger.
+
+        Like the real sensor, scans are only reported in detection mode.
+        """
+        if self.mode != "detection":
+            return False
+
+        if fingerprint_id is None:
+            self.write_line(NO_MATCH_LINE)
+        else:
+            self.write_line(DETECTION_LINE.format(id=fingerprint_id))
+            if self.emit_callback:
+                self.emit_callback(fingerprint_id, time.perf_counter())
+        self.scans_emitted += 1
+        return True
+
+    def replay(self, fingerprint_ids: Iterable[Optional[int]], rate: float = 1.0, burst: int = 1) -> int:
+        """Replay scans at ``rate`` scans per second, ``burst`` at a time.
+
+        Each burst is written back to back, and bursts are spaced so the
+        average rate matches ``rate``. Returns the number of scans emitted.
+        """
+        interval = burst / rate if rate > 0 else 0
+        next_tick = time.perf_counter()
+        emitted = 0
+        batch = []
+
+        for fingerprint_id in fingerprint_ids:
+            batch.append(fingerprint_id)
+            if len(batch) < burst:
+                continue
+            emitted += self._emit_burst(batch, next_tick)
+            next_tick += interval
+            batch = []
+
+        if batch:
+            emitted += self._emit_burst(batch, next_tick)
+        return emitted
+
+    def _emit_burst(self, fingerprint_ids: list, at: float) -> int:
+        delay = at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return sum(1 for fingerprint_id in fingerprint_ids if self.scan(fingerprint_id))
+
+    def _read_commands(self):
+        """Read newline-terminated commands sent by the host"""
+        buffer = bytearray()
+        while self._running:
+            try:
+                ready, _, _ = select.select([self.master_fd], [], [], 0.1)
+                if not ready:
+                    continue
+                chunk = os.read(self.master_fd, 1024)
+            except OSError:
+                break
+
+            buffer.extend(chunk)
+            while b"\n" in buffer:
+                line, _, rest = buffer.partition(b"\n")
+                buffer = bytearray(rest)
+                command = line.decode(errors="replace").strip()
+                if command:
+                    self._handle_command(command)
+
+    def _handle_command(self, command: str):
+        if self._awaiting_enroll_id:
+            self._awaiting_enroll_id = False
+            try:
+                fingerprint_id = int(command)
+            except ValueError:
+                self.write_line("Invalid ID")
+                self.mode = "menu"
+                return
+            threading.Thread(target=self._enroll, args=(fingerprint_id,), daemon=True).start()
+        elif command == "d":
+            self.mode = "detection"
+            self.write_line("Detection mode - place finger on sensor")
+        elif command == "m":
+            self.mode = "menu"
+            self.write_line("Menu")
+        elif command == "e":
+            self.mode = "enrollment"
+            self._awaiting_enroll_id = True
+            self.write_line("Enter ID # (1-127) to enroll")
+
+    def _enroll(self, fingerprint_id: int):
+        """Play back the sketch's enrollment sequence"""
+        self.write_line(ENROLL_START_LINE.format(id=fingerprint_id))
+        for line in ENROLL_STEP_LINES:
+            time.sleep(self.enroll_step_delay)
+            self.write_line(line)
+
+        time.sleep(self.enroll_step_delay)
+        if random.random() < self.enroll_failure_rate:
+            self.write_line(ENROLL_FAILURE_LINE)
+        else:
+            self.write_line(ENROLL_SUCCESS_LINE)
+        self.mode = "menu"
+
+
+def _parse_ids(spec: str) -> list:
+    """Parse an ID list such as "1-50" or "1,2,5" """
+    ids = []
+    for part in spec.split(","):
+        if "-" in part:
+            low, high = part.split("-", 1)
+            ids.extend(range(int(low), int(high) + 1))
+        elif part:
+            ids.append(int(part))
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the Arduino fingerprint sensor on a pseudo-terminal")
+    parser.add_argument("--ids", default="1-50", help="fingerprint IDs to scan, e.g. 1-50 or 1,2,5")
+    parser.add_argument("--rate", type=float, default=2.0, help="average scans per second")
+    parser.add_argument("--burst", type=int, default=1, help="scans emitted back to back per tick")
+    parser.add_argument("--count", type=int, default=100, help="total scans to replay")
+    parser.add_argument("--unknown", type=float, default=0.0, help="fraction of scans from unknown fingers")
+    args = parser.parse_args()
+
+    ids = _parse_ids(args.ids)
+    with ArduinoSimulator() as simulator:
+        print(f"Simulated Arduino listening on {simulator.port}")
+        print("Waiting for the host to start detection mode...")
+        simulator.wait_for_mode("detection", timeout=float("inf"))
+
+        scans = (None if random.random() < args.unknown else random.choice(ids)
+                 for _ in range(args.count))
+        start = time.perf_counter()
+        emitted = simulator.replay(scans, rate=args.rate, burst=args.burst)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {emitted} scans in {elapsed:.1f} s ({emitted / elapsed:.1f} scans/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Scan-to-log latency benchmark for DatabaseManager.
+
+Compares the old connect-per-call access pattern against DatabaseManager,
+which uses pooled connections and an in-memory fingerprint ID cache. Each
+"scan" is one user lookup by fingerprint ID followed by one attendance
+insert, which is what the detection handler does for every successful
+fingerprint match.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_db_latency --scans 2000
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from database.db_manager import DatabaseManager
+
+
+def seed_users(db: DatabaseManager, count: int):
+    for fid in range(1, count + 1):
+        db.add_user(fid, f"Student {fid}", f"S-{fid:05d}")
+
+
+def scan_connect_per_call(db_path: str, fingerprint_id: int):
+    """Baseline: open and close a connection for the lookup and the insert"""
+    conn = sqlite3.connect(db_path)
+    row = conn.execute(
+        "SELECT id, fingerprint_id, name, school_id, profile_picture FROM users WHERE fingerprint_id = ?",
+        (fingerprint_id,)
+    ).fetchone()
+    conn.close()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO attendance_logs (user_id) VALUES (?)", (row[0],))
+    conn.commit()
+    conn.close()
+
+
+def scan_db_manager(db: DatabaseManager, fingerprint_id: int):
+    user = db.get_user_by_fingerprint(fingerprint_id)
+    db.log_attendance(user['id'])
+
+
+def measure(label: str, scan, scans: int, users: int) -> dict:
+    samples = []
+    for i in range(scans):
+        fingerprint_id = (i % users) + 1
+        start = time.perf_counter()
+        scan(fingerprint_id)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    result = {
+        'label': label,
+        'scans': scans,
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p95_ms': samples[int(len(samples) * 0.95) - 1],
+        'p99_ms': samples[int(len(samples) * 0.99) - 1],
+    }
+    print(f"{label:<20} mean {result['mean_ms']:.3f} ms  p50 {result['p50_ms']:.3f} ms  "
+          f"p95 {result['p95_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scans", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = DatabaseManager(db_path)
+        seed_users(db, args.users)
+
+        before = measure("connect-per-call", lambda fid: scan_connect_per_call(db_path, fid),
+                         args.scans, args.users)
+        after = measure("DatabaseManager", lambda fid: scan_db_manager(db, fid), args.scans, args.users)
+        db.close()
+
+    print(f"speedup (mean): {before['mean_ms'] / after['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
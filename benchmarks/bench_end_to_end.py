@@ -0,0 +1,241 @@
+"""End-to-end scan latency benchmark.
+
+Drives the whole detection path headlessly:
+
+    simulator (pty) -> ArduinoComm -> detection handler -> DatabaseManager
+
+and reports p50/p95/p99 latency for each stage plus throughput, for a set
+of synthetic scan streams against a seeded database. Stages are measured
+from the moment the simulated sensor writes "ACCESS GRANTED":
+
+    serial   - the line reached ArduinoComm's detection callback
+    ui       - the handler looked the user up and updated the (headless) UI
+    commit   - the attendance row was committed to attendance_logs
+
+Results are written as JSON so runs can be compared between versions with
+--baseline. POSIX only, because the simulator uses a pseudo-terminal.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_end_to_end --users 100 --logs 10000000
+    python -m benchmarks.bench_end_to_end --logs 100000 --baseline old.json
+"""
+import argparse
+import json
+import os
+import platform
+import queue
+import random
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from arduino.arduino_comm import ArduinoComm
+from arduino.simulator import ArduinoSimulator
+from database.db_manager import DatabaseManager
+from service.pipeline import AttendancePipeline
+
+
+# (name, scans per second, burst size)
+SCENARIOS = [
+    ("steady", 5.0, 1),
+    ("rush_hour", 50.0, 5),
+    ("saturation", 500.0, 25),
+]
+
+
+class HeadlessDetectionHandler:
+    """Stand-in for DetectionFrame's detection handling without Tk.
+
+    Detections are handed to a "UI" thread through a queue, the way
+    DetectionFrame uses after(0, ...) to reach the Tk main loop, and the UI
+    thread runs the same AttendancePipeline as _process_detection. Debouncing
+    is off so every synthetic scan reaches the database.
+    """
+
+    def __init__(self, db):
+        self.pipeline = AttendancePipeline(db, debounce_window=0)
+        self.callback_times = []
+        self.ui_times = []
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._ui_loop, daemon=True)
+        self._thread.start()
+
+    def on_fingerprint_detected(self, fingerprint_id: int):
+        self.callback_times.append(time.perf_counter())
+        self._events.put(fingerprint_id)
+
+    def stop(self):
+        self._events.put(None)
+        self._thread.join(timeout=5)
+
+    def _ui_loop(self):
+        while True:
+            fingerprint_id = self._events.get()
+            if fingerprint_id is None:
+                return
+            self.pipeline.handle_scan(fingerprint_id)
+            self.ui_times.append(time.perf_counter())
+
+
+def seed_database(db_path: str, users: int, logs: int):
+    """Create a database with ``users`` users and ``logs`` attendance rows"""
+    db = DatabaseManager(db_path)
+    for fid in range(1, users + 1):
+        db.add_user(fid, f"Student {fid}", f"S-{fid:05d}")
+    db.close()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous=OFF")
+    start = datetime(2020, 1, 1)
+    step = timedelta(seconds=max(1, int(5 * 365 * 86400 / max(logs, 1))))
+    rows = ((random.randint(1, users), (start + step * i).strftime("%Y-%m-%d %H:%M:%S"))
+            for i in range(logs))
+    conn.executemany("INSERT INTO attendance_logs (user_id, timestamp) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def percentiles(samples_ms: list) -> dict:
+    if not samples_ms:
+        return {}
+    ordered = sorted(samples_ms)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {
+        'p50_ms': round(pick(0.50), 3),
+        'p95_ms': round(pick(0.95), 3),
+        'p99_ms': round(pick(0.99), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def run_scenario(db_path: str, users: int, name: str, rate: float, burst: int, scans: int) -> dict:
+    db = DatabaseManager(db_path)
+    handler = HeadlessDetectionHandler(db)
+    emit_times = []
+    commit_times = []
+    db.add_commit_listener(lambda entries: commit_times.extend([time.perf_counter()] * len(entries)))
+
+    with ArduinoSimulator() as simulator:
+        simulator.emit_callback = lambda fingerprint_id, at: emit_times.append(at)
+
+        comm = ArduinoComm(port=simulator.port)
+        if not comm.connect():
+            raise SystemExit(f"Could not open {simulator.port}")
+        comm.set_detection_callback(handler.on_fingerprint_detected)
+        comm.start_detection_mode()
+        simulator.wait_for_mode("detection")
+
+        ids = [random.randint(1, users) for _ in range(scans)]
+        simulator.replay(ids, rate=rate, burst=burst)
+
+        # Wait for every scan to travel through the pipeline
+        deadline = time.monotonic() + 30
+        while len(handler.ui_times) < scans and time.monotonic() < deadline:
+            time.sleep(0.01)
+        db.attendance_writer.flush(timeout=30)
+        comm.disconnect()
+
+    handler.stop()
+    db.close()
+
+    # Scans stay in order through every stage, so index i is the same scan
+    def stage(times):
+        return [(t - e) * 1000 for e, t in zip(emit_times, times)]
+
+    elapsed = (commit_times[-1] - emit_times[0]) if commit_times else 0
+    result = {
+        'scenario': name,
+        'rate': rate,
+        'burst': burst,
+        'scans': scans,
+        'completed': len(commit_times),
+        'throughput_per_s': round(len(commit_times) / elapsed, 1) if elapsed else 0,
+        'serial': percentiles(stage(handler.callback_times)),
+        'ui': percentiles(stage(handler.ui_times)),
+        'commit': percentiles(stage(commit_times)),
+    }
+    print(f"  {name:<12} {result['throughput_per_s']:>8} scans/s  "
+          f"serial p50 {result['serial'].get('p50_ms')} ms  "
+          f"ui p95 {result['ui'].get('p95_ms')} ms  "
+          f"commit p99 {result['commit'].get('p99_ms')} ms")
+    return result
+
+
+def environment() -> dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                  capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        'git_revision': revision,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'run_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict, baseline_path: str):
+    """Print p95 commit latency and throughput against a previous run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    previous = {(r['logs'], r['scenario']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path} ({baseline['environment'].get('git_revision')}):")
+    for result in results['results']:
+        old = previous.get((result['logs'], result['scenario']))
+        if not old:
+            continue
+        old_p95 = old['commit'].get('p95_ms') or 0
+        new_p95 = result['commit'].get('p95_ms') or 0
+        print(f"  {result['logs']:>10} logs {result['scenario']:<12} "
+              f"commit p95 {old_p95} -> {new_p95} ms, "
+              f"throughput {old['throughput_per_s']} -> {result['throughput_per_s']} scans/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--logs", type=int, nargs="+", default=[10_000_000],
+                        help="attendance rows to seed; several sizes run one after another")
+    parser.add_argument("--scans", type=int, default=500, help="scans per scenario")
+    parser.add_argument("--output", default=None, help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'users': args.users, 'results': []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for logs in args.logs:
+            db_path = os.path.join(tmp, f"bench_{logs}.db")
+            start = time.perf_counter()
+            seed_database(db_path, args.users, logs)
+            print(f"{args.users} users / {logs} logs (seeded in {time.perf_counter() - start:.1f} s)")
+
+            for name, rate, burst in SCENARIOS:
+                result = run_scenario(db_path, args.users, name, rate, burst, args.scans)
+                result['logs'] = logs
+                results['results'].append(result)
+
+    output = args.output or os.path.join(
+        "benchmarks", "results",
+        f"e2e_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Lines-per-second micro-benchmark for the Arduino protocol parser.
+
+Feeds a synthetic stream of sketch output (mostly detections, with misses,
+enrollment runs, sensor errors and menu text) through ProtocolParser in
+serial-read-sized chunks, and through the previous substring-chain
+_process_message with its per-line print, and reports lines parsed per
+second for each. No serial port is needed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_protocol_parser --lines 200000
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from arduino.protocol import (
+    DETECTION_LINE, ENROLL_FAILURE_LINE, ENROLL_START_LINE, ENROLL_STEP_LINES, ENROLL_SUCCESS_LINE,
+    LINE_PATTERNS, NO_MATCH_LINE, Detected, ProtocolParser, UnknownLine
+)
+
+OTHER_LINES = ["Imaging error", "Communication error", "Detection mode - place finger on sensor", "Menu"]
+
+
+def make_stream(lines: int, seed: int = 0) -> bytes:
+    """Sketch output of roughly ``lines`` lines, CRLF-terminated like Serial.println"""
+    rng = random.Random(seed)
+    output = []
+    while len(output) < lines:
+        roll = rng.random()
+        if roll < 0.80:
+            output.append(DETECTION_LINE.format(id=rng.randint(1, 127)))
+        elif roll < 0.90:
+            output.append(NO_MATCH_LINE)
+        elif roll < 0.95:
+            output.append(ENROLL_START_LINE.format(id=rng.randint(1, 127)))
+            output.extend(ENROLL_STEP_LINES)
+            output.append(rng.choice([ENROLL_SUCCESS_LINE, ENROLL_FAILURE_LINE]))
+        else:
+            output.append(rng.choice(OTHER_LINES))
+    return "".join(line + "\r\n" for line in output[:lines]).encode()
+
+
+def chunks(stream: bytes, size: int) -> list:
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+class PreviousParser:
+    """The substring chain ArduinoComm._process_message used before ProtocolParser"""
+
+    def __init__(self, callback):
+        self.detection_callback = callback
+        self.enroll_step = 0
+
+    def feed(self, data: bytes, buffer: bytearray):
+        buffer.extend(data)
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line = buffer[:newline].decode(errors="replace").strip()
+            del buffer[:newline + 1]
+            if line:
+                self.process_message(line)
+
+    def process_message(self, message: str):
+        print(f"Arduino: {message}")
+
+        if "ACCESS GRANTED - ID #" in message:
+            try:
+                parts = message.split("ID #")
+                if len(parts) > 1:
+                    fingerprint_id = int(parts[1].split()[0])
+                    if self.detection_callback:
+                        self.detection_callback(fingerprint_id)
+            except (ValueError, IndexError) as e:
+                print(f"Error parsing fingerprint ID: {e}")
+        elif message.startswith("Enrolling ID #"):
+            self.enroll_step = 0
+        elif message.startswith(ENROLL_STEP_LINES):
+            self.enroll_step = min(self.enroll_step + 1, len(ENROLL_STEP_LINES))
+        elif ENROLL_SUCCESS_LINE in message:
+            pass
+        elif ENROLL_FAILURE_LINE in message:
+            pass
+
+
+def run_previous(data: list, lines: int) -> int:
+    detections = []
+    previous = PreviousParser(detections.append)
+    buffer = bytearray()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for chunk in data:
+            previous.feed(chunk, buffer)
+    return len(detections)
+
+
+def run_parser(data: list, all_events: bool) -> int:
+    detections = []
+    parser = ProtocolParser()
+    parser.set_callback(Detected, detections.append)
+    if all_events:
+        ignore = [].append
+        for event_type, _ in LINE_PATTERNS:
+            if event_type is not Detected:
+                parser.set_callback(event_type, ignore)
+        parser.set_callback(UnknownLine, ignore)
+    for chunk in data:
+        parser.feed(chunk)
+    return len(detections)
+
+
+def measure(label: str, run, lines: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        detections = run()
+        best = min(best, time.perf_counter() - start)
+    rate = lines / best
+    print(f"{label:<28} {rate:>12,.0f} lines/s  {best * 1e6 / lines:6.2f} us/line  "
+          f"({detections:,} detections)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=64, help="bytes per simulated serial read")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per parser; the best is reported")
+    args = parser.parse_args()
+
+    data = chunks(make_stream(args.lines), args.chunk_size)
+    previous = measure("previous (print per line)", lambda: run_previous(data, args.lines),
+                       args.lines, args.repeat)
+    detections = measure("parser (detections only)", lambda: run_parser(data, False),
+                         args.lines, args.repeat)
+    measure("parser (every event type)", lambda: run_parser(data, True), args.lines, args.repeat)
+    print(f"lines per second up {detections / previous:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Message-to-callback latency benchmark for ArduinoComm.
+
+Feeds detection lines into ArduinoComm through a pseudo-terminal and times
+how long each one takes to reach the detection callback, for both the
+current blocking reader and the previous 100 ms polling loop. Needs a
+POSIX system for the pseudo-terminal.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serial_latency --messages 200
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+import tty
+
+from arduino.arduino_comm import ArduinoComm
+
+
+class PollingArduinoComm(ArduinoComm):
+    """ArduinoComm with the previous sleep-and-poll listening loop"""
+
+    def _listen_loop(self):
+        while self.listening and self.is_connected and self.serial_conn:
+            try:
+                if self.serial_conn.in_waiting > 0:
+                    line = self.serial_conn.readline().decode().strip()
+                    if line:
+                        self._process_message(line)
+                time.sleep(0.1)
+            except Exception as e:
+                print(f"Error in listen loop: {e}")
+                break
+
+
+def measure(label: str, comm_class, messages: int) -> dict:
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(slave_fd)
+    port = os.ttyname(slave_fd)
+
+    received = threading.Event()
+    samples = []
+    sent_at = [0.0]
+
+    def on_detected(fingerprint_id):
+        samples.append((time.perf_counter() - sent_at[0]) * 1000)
+        received.set()
+
+    comm = comm_class(port=port)
+    if not comm.connect():
+        raise SystemExit(f"Could not open {port}")
+    comm.set_detection_callback(on_detected)
+    comm.start_listening()
+
+    for i in range(messages):
+        # Random gaps so arrivals do not line up with any polling period
+        time.sleep(random.uniform(0.0, 0.05))
+        received.clear()
+        sent_at[0] = time.perf_counter()
+        os.write(master_fd, f"✓ ACCESS GRANTED - ID #{i % 127 + 1} detected!\r\n".encode())
+        received.wait(timeout=2)
+
+    comm.disconnect()
+    os.close(master_fd)
+    os.close(slave_fd)
+
+    samples.sort()
+    result = {
+        'label': label,
+        'messages': len(samples),
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p95_ms': samples[int(len(samples) * 0.95) - 1],
+        'max_ms': samples[-1],
+    }
+    print(f"{label:<10} mean {result['mean_ms']:.2f} ms  p50 {result['p50_ms']:.2f} ms  "
+          f"p95 {result['p95_ms']:.2f} ms  max {result['max_ms']:.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    polling = measure("polling", PollingArduinoComm, args.messages)
+    blocking = measure("blocking", ArduinoComm, args.messages)
+    print(f"mean latency reduced {polling['mean_ms'] / blocking['mean_ms']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
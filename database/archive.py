@@ -0,0 +1,50 @@
+"""Archive closed terms of attendance logs from the command line.
+
+Moves every month before the given one into compressed, read-only monthly
+partitions next to the database, e.g. at the start of a new term:
+
+    python -m database.archive --before 2025-01
+    python -m database.archive --list
+"""
+import argparse
+import sys
+
+from database.db_manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old attendance logs into monthly partitions")
+    parser.add_argument("--db", default="attendance.db", help="path to the SQLite database")
+    parser.add_argument("--archive-dir", default=None,
+                        help="where partitions are kept (default: archive/ next to the database)")
+    parser.add_argument("--before", help="archive every month before this one (YYYY-MM)")
+    parser.add_argument("--vacuum", action="store_true", help="shrink the database file afterwards")
+    parser.add_argument("--list", action="store_true", help="list archived months")
+    args = parser.parse_args()
+
+    if not args.before and not args.list:
+        parser.error("give --before YYYY-MM or --list")
+
+    db = DatabaseManager(args.db, archive_dir=args.archive_dir)
+    try:
+        if args.before:
+            try:
+                results = db.archive_logs(args.before, vacuum=args.vacuum)
+            except ValueError as e:
+                sys.exit(str(e))
+            for result in results:
+                print(f"{result['period']}: moved {result['moved']:,} logs "
+                      f"({result['row_count']:,} archived) to {result['path']}")
+            if not results:
+                print(f"No attendance logs before {args.before}")
+
+        if args.list:
+            for partition in db.get_partitions():
+                print(f"{partition['period']}  {partition['row_count']:>9,} logs  "
+                      f"archived {partition['archived_at']}  {partition['path']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import queue
+import threading
+import time
+from typing import Optional
+
+from database.timestamps import utc_timestamp
+
+
+class AttendanceWriter:
+    """Write-behind logger that batches attendance inserts on its own thread.
+
+    submit() only enqueues the scan with its timestamp, so callers never wait
+    on the disk. The writer thread groups queued scans into one transaction
+    once ``batch_size`` are waiting or ``flush_interval`` seconds have passed.
+    """
+
+    MAX_RETRIES = 3
+
+    def __init__(self, db, max_queue: int = 1000, batch_size: int = 50, flush_interval: float = 0.2):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._pending = 0  # Submitted but not yet committed
+        self._pending_cond = threading.Condition()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of scans waiting to be written"""
+        return self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread if it is not running yet"""
+        with self._start_lock:
+            if self.running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="AttendanceWriter", daemon=True)
+            self._thread.start()
+
+    def submit(self, user_id: int, timestamp: Optional[str] = None, sensor_id: Optional[str] = None) -> bool:
+        """Queue an attendance log without blocking.
+
+        Returns False if the queue is full, in which case nothing was queued.
+        """
+        if not self.running:
+            self.start()
+
+        with self._pending_cond:
+            try:
+                self._queue.put_nowait((user_id, timestamp or utc_timestamp(), sensor_id))
+            except queue.Full:
+                return False
+            self._pending += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted scan has been written"""
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Write everything still queued, then stop the writer thread"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """Writer thread main loop"""
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            # Gather more scans until the batch is full or the interval elapses
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping.is_set():
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except queue.Empty:
+                        break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list):
+        """Insert a batch in one transaction, retrying transient failures"""
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                self.db.write_attendance_batch(batch)
+                break
+            except Exception as e:
+                print(f"Database error writing attendance batch (attempt {attempt}): {e}")
+                time.sleep(0.1 * attempt)
+        else:
+            print(f"Dropped {len(batch)} attendance logs after {self.MAX_RETRIES} attempts")
+
+        with self._pending_cond:
+            self._pending -= len(batch)
+            self._pending_cond.notify_all()
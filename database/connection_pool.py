@@ -0,0 +1,101 @@
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+# Pragmas applied once to every pooled connection when it is opened
+DEFAULT_PRAGMAS: List[Tuple[str, str]] = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("foreign_keys", "ON"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-8000"),  # ~8 MB page cache per connection
+]
+
+
+class ConnectionPool:
+    """Small pool of reusable SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed out to one thread
+    at a time, so they are created with ``check_same_thread=False`` and can be
+    reused by whichever thread checks them out next.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, cached_statements: int = 128,
+                 timeout: float = 5.0):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            uri=True  # Lets ATTACH open archive partitions read-only
+        )
+        for name, value in DEFAULT_PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check a connection out of the pool, opening one if needed"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._create_connection()
+                self._all.append(conn)
+                return conn
+
+        # Pool exhausted, wait for another thread to return a connection
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool"""
+        if self._closed:
+            conn.close()
+            return
+
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every connection owned by the pool"""
+        with self._lock:
+            self._closed = True
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all.clear()
+
+        while not self._idle.empty():
+            self._idle.get_nowait()
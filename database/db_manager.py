@@ -1,65 +1,127 @@
 import sqlite3
 import os
+import threading
+import hashlib
 from datetime import datetime
-from typing import Optional, List, Dict
+from contextlib import closing
+from typing import Optional, List, Dict, Tuple, Callable, Iterator
 import base64
+from database.connection_pool import ConnectionPool
+from database.migrations import LOCAL_DAYS_VERSION, get_schema_version, run_migrations
+from database.partitions import PartitionStore, archive_before, period_bounds
+from database.thumbnails import make_thumbnail, make_thumbnails
+from database.attendance_writer import AttendanceWriter
+from database.timestamps import (
+    local_day_bounds, local_today, to_local, to_local_datetime, to_utc_timestamp, utc_timestamp
+)
 
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "attendance.db"):
+    MAX_INLINE_USER_IDS = 500  # Larger student matches are filtered with a subquery
+
+    def __init__(self, db_path: str = "attendance.db", pool_size: int = 4,
+                 archive_dir: Optional[str] = None):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, size=pool_size)
+
+        # Compressed monthly partitions of archived attendance logs
+        self.partitions = PartitionStore(
+            archive_dir or os.path.join(os.path.dirname(db_path) or ".", "archive"))
+
+        # fingerprint_id -> user dict, preloaded so scans never touch the disk
+        self._user_cache: Dict[int, Dict] = {}
+        self._users_by_id: Dict[int, Dict] = {}
+        self._user_cache_lock = threading.Lock()
+
         self.init_database()
+        self.load_user_cache()
+
+        # Background writer for attendance logs from the scan path
+        self.attendance_writer = AttendanceWriter(self)
+        self._commit_listeners: List[Callable[[List[Dict]], None]] = []
+
+    def close(self):
+        """Write any queued attendance logs and close all pooled connections"""
+        self.attendance_writer.stop()
+        self.pool.close()
 
     def init_database(self):
         """Initialize database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY,
-                fingerprint_id INTEGER UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                school_id TEXT UNIQUE NOT NULL,
-                profile_picture BLOB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Attendance logs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS attendance_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+
+            # Users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY,
+                    fingerprint_id INTEGER UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    school_id TEXT UNIQUE NOT NULL,
+                    profile_picture BLOB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Attendance logs table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attendance_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+
+            conn.commit()
+
+            # Upgrade existing databases in place
+            previous_version = get_schema_version(conn)
+            self.schema_version = run_migrations(conn)
+
+            # Migrations only read attendance_logs, so day tables they rebuilt
+            # still need the archived months counted in
+            recount_archives = (
+                previous_version < LOCAL_DAYS_VERSION <= self.schema_version
+                and conn.execute('SELECT 1 FROM attendance_partitions LIMIT 1').fetchone() is not None
             )
-        ''')
 
-        conn.commit()
-        conn.close()
+            self.has_student_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'"
+            ).fetchone() is not None
+
+        if recount_archives:
+            self.rebuild_daily_summary()
 
     def add_user(self, fingerprint_id: int, name: str, school_id: str,
                  profile_picture_path: Optional[str] = None) -> bool:
         """Add a new user to the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             # Convert image to blob if provided
             profile_blob = None
             if profile_picture_path and os.path.exists(profile_picture_path):
                 with open(profile_picture_path, 'rb') as f:
                     profile_blob = f.read()
 
-            cursor.execute('''
-                INSERT INTO users (fingerprint_id, name, school_id, profile_picture)
-                VALUES (?, ?, ?, ?)
-            ''', (fingerprint_id, name, school_id, profile_blob))
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                # Pictures live in profile_images, keyed by content hash
+                image_hash = None
+                if profile_blob:
+                    image_hash = self._store_profile_image(cursor, profile_blob)
+
+                cursor.execute('''
+                    INSERT INTO users (fingerprint_id, name, school_id, profile_image_hash)
+                    VALUES (?, ?, ?, ?)
+                ''', (fingerprint_id, name, school_id, image_hash))
+
+                # Render the display sizes once now instead of on every scan
+                if profile_blob:
+                    self._store_thumbnails(cursor, cursor.lastrowid, profile_blob)
+
+                conn.commit()
+
+            self.invalidate_user_cache(fingerprint_id)
             return True
 
         except sqlite3.IntegrityError as e:
@@ -69,124 +131,818 @@ class DatabaseManager:
             print(f"Database error: {e}")
             return False
 
-    def get_user_by_fingerprint(self, fingerprint_id: int) -> Optional[Dict]:
-        """Get user by fingerprint ID"""
+    def add_users(self, users: List[Dict]) -> bool:
+        """Add many users in one transaction; either all of them are added or none.
+
+        Each dict has fingerprint_id, name and school_id, and optionally the
+        encoded ``photo`` and its pre-rendered ``thumbnails`` ({size: PNG bytes}).
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                SELECT id, fingerprint_id, name, school_id, profile_picture
-                FROM users WHERE fingerprint_id = ?
-            ''', (fingerprint_id,))
+                image_hashes = {
+                    user['fingerprint_id']: hashlib.sha256(user['photo']).hexdigest()
+                    for user in users if user.get('photo')
+                }
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO profile_images (hash, image) VALUES (?, ?)',
+                    [(image_hashes[user['fingerprint_id']], user['photo'])
+                     for user in users if user.get('photo')]
+                )
+                cursor.executemany('''
+                    INSERT INTO users (fingerprint_id, name, school_id, profile_image_hash)
+                    VALUES (?, ?, ?, ?)
+                ''', [(user['fingerprint_id'], user['name'], user['school_id'],
+                       image_hashes.get(user['fingerprint_id']))
+                      for user in users])
 
-            row = cursor.fetchone()
-            conn.close()
+                # executemany does not report row IDs, so look them up for the thumbnails
+                with_thumbnails = [user for user in users if user.get('thumbnails')]
+                if with_thumbnails:
+                    fingerprint_ids = [user['fingerprint_id'] for user in with_thumbnails]
+                    user_ids = dict(cursor.execute(
+                        f"SELECT fingerprint_id, id FROM users "
+                        f"WHERE fingerprint_id IN ({', '.join('?' * len(fingerprint_ids))})",
+                        fingerprint_ids
+                    ).fetchall())
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO user_thumbnails (user_id, size, image)
+                        VALUES (?, ?, ?)
+                    ''', [(user_ids[user['fingerprint_id']], size, data)
+                          for user in with_thumbnails
+                          for size, data in user['thumbnails'].items()])
 
-            if row:
-                return {
-                    'id': row[0],
-                    'fingerprint_id': row[1],
-                    'name': row[2],
-                    'school_id': row[3],
-                    'profile_picture': row[4]
-                }
+                conn.commit()
+
+            self.invalidate_user_cache()
+            return True
+
+        except sqlite3.IntegrityError as e:
+            print(f"Database integrity error: {e}")
+            return False
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+
+    def _store_profile_image(self, cursor, image_data: bytes) -> str:
+        """Save an image in content-addressed storage and return its hash"""
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        cursor.execute(
+            'INSERT OR IGNORE INTO profile_images (hash, image) VALUES (?, ?)',
+            (image_hash, image_data)
+        )
+        return image_hash
+
+    def get_profile_picture(self, user_id: int) -> Optional[bytes]:
+        """Load a user's original profile picture on demand"""
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute('''
+                    SELECT p.image
+                    FROM users u
+                    JOIN profile_images p ON p.hash = u.profile_image_hash
+                    WHERE u.id = ?
+                ''', (user_id,)).fetchone()
+
+            return row[0] if row else None
+
+        except Exception as e:
+            print(f"Database error: {e}")
             return None
 
+    def _store_thumbnails(self, cursor, user_id: int, image_data: bytes):
+        """Render and save thumbnails for a user's profile picture"""
+        try:
+            thumbnails = make_thumbnails(image_data)
+        except Exception as e:
+            print(f"Error creating thumbnails: {e}")
+            return
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO user_thumbnails (user_id, size, image)
+            VALUES (?, ?, ?)
+        ''', [(user_id, size, data) for size, data in thumbnails.items()])
+
+    def get_thumbnail(self, user_id: int, size: int) -> Optional[bytes]:
+        """Get a user's profile picture thumbnail as PNG bytes.
+
+        Thumbnails missing for users enrolled before they existed are rendered
+        from the original picture and saved on first use.
+        """
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    'SELECT image FROM user_thumbnails WHERE user_id = ? AND size = ?',
+                    (user_id, size)
+                ).fetchone()
+                if row:
+                    return row[0]
+
+            picture = self.get_profile_picture(user_id)
+            if not picture:
+                return None
+
+            thumbnail = make_thumbnail(picture, size)
+            with self.pool.connection() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO user_thumbnails (user_id, size, image)
+                    VALUES (?, ?, ?)
+                ''', (user_id, size, thumbnail))
+                conn.commit()
+            return thumbnail
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            return None
+
+    def _fetch_users(self, fingerprint_id: Optional[int] = None) -> List[Dict]:
+        """Read full user rows, optionally for a single fingerprint ID"""
+        query = '''
+            SELECT id, fingerprint_id, name, school_id
+            FROM users
+        '''
+        params = []
+        if fingerprint_id is not None:
+            query += " WHERE fingerprint_id = ?"
+            params.append(fingerprint_id)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'id': row[0],
+                'fingerprint_id': row[1],
+                'name': row[2],
+                'school_id': row[3]
+            }
+            for row in rows
+        ]
+
+    def load_user_cache(self):
+        """Preload every user into the fingerprint ID cache"""
+        try:
+            users = self._fetch_users()
+            with self._user_cache_lock:
+                self._user_cache = {user['fingerprint_id']: user for user in users}
+                self._users_by_id = {user['id']: user for user in users}
+
+        except Exception as e:
+            print(f"Database error: {e}")
+
+    def invalidate_user_cache(self, fingerprint_id: Optional[int] = None):
+        """Refresh cached users after a write.
+
+        Call with the affected fingerprint ID after adding, updating or deleting
+        a user, or with no argument to reload the whole roster.
+        """
+        if fingerprint_id is None:
+            self.load_user_cache()
+            return
+
+        try:
+            users = self._fetch_users(fingerprint_id)
+            with self._user_cache_lock:
+                self._uncache_user(fingerprint_id)
+                if users:
+                    self._cache_user(users[0])
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            with self._user_cache_lock:
+                self._uncache_user(fingerprint_id)
+
+    def _cache_user(self, user: Dict):
+        """Add a user to both cache indexes; hold _user_cache_lock"""
+        self._user_cache[user['fingerprint_id']] = user
+        self._users_by_id[user['id']] = user
+
+    def _uncache_user(self, fingerprint_id: int):
+        """Remove a user from both cache indexes; hold _user_cache_lock"""
+        user = self._user_cache.pop(fingerprint_id, None)
+        if user:
+            self._users_by_id.pop(user['id'], None)
+
+    def get_enrolled_ids(self) -> Tuple[set, set]:
+        """Fingerprint IDs and school IDs of every enrolled user, from the in-memory cache"""
+        with self._user_cache_lock:
+            return set(self._user_cache), {user['school_id'] for user in self._user_cache.values()}
+
+    def get_cached_user(self, user_id: int) -> Optional[Dict]:
+        """Get a user by database ID from the in-memory cache"""
+        return self._users_by_id.get(user_id)
+
+    def get_user_by_fingerprint(self, fingerprint_id: int) -> Optional[Dict]:
+        """Get user by fingerprint ID"""
+        user = self._user_cache.get(fingerprint_id)
+        if user is not None:
+            return user
+
+        # Not cached: the user may have been added by another process
+        try:
+            users = self._fetch_users(fingerprint_id)
+            if not users:
+                return None
+
+            with self._user_cache_lock:
+                self._cache_user(users[0])
+            return users[0]
+
         except Exception as e:
             print(f"Database error: {e}")
             return None
 
-    def log_attendance(self, user_id: int) -> bool:
+    def log_attendance(self, user_id: int, sensor_id: Optional[str] = None) -> bool:
         """Log attendance for a user"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            self.write_attendance_batch([(user_id, utc_timestamp(), sensor_id)])
+            return True
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+
+    def log_attendance_async(self, user_id: int, sensor_id: Optional[str] = None) -> bool:
+        """Queue an attendance log for the background writer.
+
+        Falls back to a synchronous insert if the writer queue is full, so a
+        scan is never lost.
+        """
+        if self.attendance_writer.submit(user_id, sensor_id=sensor_id):
+            return True
+
+        print("Attendance queue full, writing synchronously")
+        return self.log_attendance(user_id, sensor_id)
+
+    def get_attendance_queue_depth(self) -> int:
+        """Number of attendance logs waiting to be written"""
+        return self.attendance_writer.queue_depth
+
+    def add_commit_listener(self, callback: Callable[[List[Dict]], None]):
+        """Call ``callback(rows)`` on the writing thread after attendance entries are committed"""
+        self._commit_listeners.append(callback)
+
+    def write_attendance_batch(self, entries: List[Tuple[int, str, Optional[str]]]):
+        """Insert (user_id, timestamp, sensor_id) attendance entries in one transaction.
+
+        attendance_daily_summary and attendance_daily_rollups are updated in
+        the same transaction.
+        """
+        rows = []
+        with self.pool.connection() as conn:
             cursor = conn.cursor()
+            # Take the write lock before reading who already scanned today, so
+            # another writer cannot count the same student between the check
+            # and the upsert
+            cursor.execute("BEGIN IMMEDIATE")
+            self._count_daily_attendance(cursor, entries)
+            self._roll_up_attendance(cursor, entries)
+
+            # One statement per row (still one transaction) so listeners get the new IDs
+            for user_id, timestamp, sensor_id in entries:
+                cursor.execute('''
+                    INSERT INTO attendance_logs (user_id, timestamp, sensor_id)
+                    VALUES (?, ?, ?)
+                ''', (user_id, timestamp, sensor_id))
+                user = self._users_by_id.get(user_id) or {}
+                rows.append({
+                    'id': cursor.lastrowid,
+                    'user_id': user_id,
+                    'timestamp': timestamp,
+                    'sensor_id': sensor_id,
+                    'name': user.get('name'),
+                    'school_id': user.get('school_id'),
+                    'fingerprint_id': user.get('fingerprint_id')
+                })
+            conn.commit()
+
+        for callback in self._commit_listeners:
+            try:
+                callback(rows)
+            except Exception as e:
+                print(f"Error in attendance commit listener: {e}")
+
+    def _user_logged_on(self, cursor, user_id: int, day: str) -> bool:
+        """Whether the user already has an attendance log on ``day``"""
+        return cursor.execute(
+            'SELECT 1 FROM attendance_daily_rollups WHERE user_id = ? AND day = ?',
+            (user_id, day)
+        ).fetchone() is not None
 
+    def _count_daily_attendance(self, cursor, entries):
+        """Add not-yet-inserted entries to attendance_daily_summary, by local day"""
+        days: Dict[str, List[int]] = {}  # day -> [scans, new students]
+        seen = set()
+        for user_id, timestamp, *_ in entries:
+            day = to_local(timestamp)[:10]
+            counts = days.setdefault(day, [0, 0])
+            counts[0] += 1
+            if (user_id, day) not in seen:
+                seen.add((user_id, day))
+                if not self._user_logged_on(cursor, user_id, day):
+                    counts[1] += 1
+
+        cursor.executemany('''
+            INSERT INTO attendance_daily_summary (day, total_scans, unique_users)
+            VALUES (?, ?, ?)
+            ON CONFLICT (day) DO UPDATE SET
+                total_scans = total_scans + excluded.total_scans,
+                unique_users = unique_users + excluded.unique_users
+        ''', [(day, scans, new_users) for day, (scans, new_users) in days.items()])
+
+    def _roll_up_attendance(self, cursor, entries):
+        """Add not-yet-inserted entries to attendance_daily_rollups, in local time"""
+        rollups: Dict[Tuple[int, str], List] = {}  # (user, day) -> [first, last, scans]
+        for user_id, timestamp, *_ in entries:
+            local = to_local(timestamp)
+            rollup = rollups.get((user_id, local[:10]))
+            if rollup is None:
+                rollups[(user_id, local[:10])] = [local, local, 1]
+            else:
+                rollup[0] = min(rollup[0], local)
+                rollup[1] = max(rollup[1], local)
+                rollup[2] += 1
+
+        cursor.executemany('''
+            INSERT INTO attendance_daily_rollups (user_id, day, first_scan, last_scan, scan_count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                first_scan = min(first_scan, excluded.first_scan),
+                last_scan = max(last_scan, excluded.last_scan),
+                scan_count = scan_count + excluded.scan_count
+        ''', [(user_id, day, *rollup) for (user_id, day), rollup in rollups.items()])
+
+    def _unroll_attendance(self, cursor, user_id: int, timestamp: str):
+        """Take a deleted log out of its attendance_daily_rollups row"""
+        day = to_local(timestamp)[:10]
+        first_scan, last_scan = cursor.execute('''
+            SELECT datetime(MIN(timestamp), 'localtime'), datetime(MAX(timestamp), 'localtime')
+            FROM attendance_logs
+            WHERE user_id = ? AND timestamp >= ? AND timestamp < ?
+        ''', (user_id, *local_day_bounds(day))).fetchone()
+
+        if first_scan is None:
+            cursor.execute(
+                'DELETE FROM attendance_daily_rollups WHERE user_id = ? AND day = ?', (user_id, day))
+        else:
             cursor.execute('''
-                INSERT INTO attendance_logs (user_id)
-                VALUES (?)
-            ''', (user_id,))
+                UPDATE attendance_daily_rollups
+                SET first_scan = ?, last_scan = ?, scan_count = scan_count - 1
+                WHERE user_id = ? AND day = ?
+            ''', (first_scan, last_scan, user_id, day))
+
+    def rebuild_rollups(self):
+        """Recompute attendance_daily_rollups from attendance_logs and every archive.
 
+        Run it after the machine's timezone changes, since days are local.
+        """
+        upsert = '''
+            INSERT INTO attendance_daily_rollups (user_id, day, first_scan, last_scan, scan_count)
+            SELECT user_id, date(timestamp, 'localtime'),
+                   datetime(MIN(timestamp), 'localtime'), datetime(MAX(timestamp), 'localtime'), COUNT(*)
+            FROM {table}
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id, date(timestamp, 'localtime')
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                first_scan = min(first_scan, excluded.first_scan),
+                last_scan = max(last_scan, excluded.last_scan),
+                scan_count = scan_count + excluded.scan_count
+        '''
+        with self.pool.connection() as conn:
+            periods = [row[0] for row in conn.execute('SELECT period FROM attendance_partitions')]
+
+            conn.execute('DELETE FROM attendance_daily_rollups')
+            conn.execute(upsert.format(table="main.attendance_logs"))
+            conn.commit()
+
+            # An archive can only be detached once the transaction reading it is over
+            for period in periods:
+                with self.partitions.attach(conn, period) as schema:
+                    conn.execute(upsert.format(table=f"{schema}.attendance_logs"))
+                    conn.commit()
+
+    def rebuild_daily_summary(self):
+        """Recount attendance_daily_summary, e.g. after logs were edited outside the app.
+
+        Rebuilds attendance_daily_rollups first and counts from them, so
+        archived months are included.
+        """
+        self.rebuild_rollups()
+        with self.pool.connection() as conn:
+            conn.execute('DELETE FROM attendance_daily_summary')
+            conn.execute('''
+                INSERT INTO attendance_daily_summary (day, total_scans, unique_users)
+                SELECT day, SUM(scan_count), COUNT(*)
+                FROM attendance_daily_rollups
+                GROUP BY day
+            ''')
             conn.commit()
-            conn.close()
-            return True
 
+    def get_daily_summary(self, day: Optional[str] = None) -> Dict:
+        """Scan and student counts for a local YYYY-MM-DD day, today by default"""
+        day = day or local_today()
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    'SELECT total_scans, unique_users FROM attendance_daily_summary WHERE day = ?',
+                    (day,)
+                ).fetchone()
         except Exception as e:
             print(f"Database error: {e}")
-            return False
+            row = None
+
+        total_scans, unique_users = row or (0, 0)
+        return {'day': day, 'total_scans': total_scans, 'unique_users': unique_users}
+
+    def get_user_count(self) -> int:
+        """Number of enrolled users, from the in-memory cache"""
+        return len(self._user_cache)
+
+    def _build_log_filters(self, start_date=None, end_date=None, student_filter=None):
+        """Build WHERE conditions and parameters shared by the attendance log queries"""
+        params = []
+        conditions = []
+
+        # Add date filtering, converted to the stored UTC timestamps
+        if start_date:
+            conditions.append("a.timestamp >= ?")
+            params.append(to_utc_timestamp(start_date))
+
+        if end_date:
+            conditions.append("a.timestamp <= ?")
+            params.append(to_utc_timestamp(end_date))
+
+        # Add student name/ID filtering: resolve the matching users first, so
+        # the logs are read through the (user_id, timestamp) index
+        if student_filter:
+            condition, user_params = self._student_condition("a.user_id", student_filter)
+            conditions.append(condition)
+            params.extend(user_params)
+
+        return conditions, params
+
+    def _student_condition(self, column: str, student_filter: str) -> Tuple[str, List]:
+        """WHERE condition limiting ``column`` to the IDs of matching users"""
+        user_ids = self.find_student_ids(student_filter)
+        if not user_ids:
+            return "0", []
+        if len(user_ids) <= self.MAX_INLINE_USER_IDS:
+            return f"{column} IN ({', '.join('?' * len(user_ids))})", user_ids
+
+        match_sql, match_params = self._student_match_query(student_filter)
+        return f"{column} IN ({match_sql})", match_params
+
+    def _student_match_query(self, student_filter: str) -> Tuple[str, List]:
+        """SQL selecting the IDs of users whose name or school ID contains the filter"""
+        # Trigrams need at least three characters; shorter filters scan users
+        if self.has_student_index and len(student_filter) >= 3:
+            phrase = '"' + student_filter.replace('"', '""') + '"'
+            return "SELECT rowid FROM users_fts WHERE users_fts MATCH ?", [phrase]
+
+        pattern = "%" + student_filter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return ("SELECT id FROM users WHERE name LIKE ? ESCAPE '\\' OR school_id LIKE ? ESCAPE '\\'",
+                [pattern, pattern])
+
+    def find_student_ids(self, student_filter: str) -> List[int]:
+        """IDs of users whose name or school ID contains the filter, ignoring case"""
+        query, params = self._student_match_query(student_filter)
+        try:
+            with self.pool.connection() as conn:
+                return [row[0] for row in conn.execute(query, params).fetchall()]
+        except Exception as e:
+            print(f"Database error: {e}")
+            return []
+
+    def get_partitions(self) -> List[Dict]:
+        """Archived months of attendance logs, oldest first"""
+        try:
+            with self.pool.connection() as conn:
+                rows = conn.execute('''
+                    SELECT period, path, row_count, min_timestamp, max_timestamp, archived_at
+                    FROM attendance_partitions ORDER BY period
+                ''').fetchall()
+        except Exception as e:
+            print(f"Database error: {e}")
+            return []
+
+        return [
+            {
+                'period': row[0],
+                'path': row[1],
+                'row_count': row[2],
+                'min_timestamp': row[3],
+                'max_timestamp': row[4],
+                'archived_at': row[5]
+            }
+            for row in rows
+        ]
+
+    def archive_logs(self, before: str, vacuum: bool = False) -> List[Dict]:
+        """Move attendance logs of every month before ``before`` (YYYY-MM) into archive partitions"""
+        return archive_before(self, before, vacuum=vacuum)
+
+    def _walk_log_tables(self, conn, start_date=None, end_date=None,
+                         before: Optional[str] = None, oldest_first: bool = False) -> Iterator[str]:
+        """Yield FROM expressions over live and archived logs in a date range; close before releasing conn"""
+        start = to_utc_timestamp(start_date) if start_date else ""
+        end = to_utc_timestamp(end_date) if end_date else "9999"
+        if before is not None:
+            end = min(end, before)
+        periods = [row[0] for row in conn.execute('''
+            SELECT period FROM attendance_partitions
+            WHERE row_count > 0 AND max_timestamp >= ? AND min_timestamp <= ?
+            ORDER BY period DESC
+        ''', (start, end))]
+        if not periods:
+            yield "main.attendance_logs"
+            return
+
+        def live_logs(lower: str, upper: Optional[str]) -> Optional[str]:
+            """attendance_logs within [lower, upper), or None when there are none"""
+            # Bounds come from period_bounds, so they are safe to inline
+            where = f"timestamp >= '{lower}'" + (f" AND timestamp < '{upper}'" if upper else "")
+            if conn.execute(f"SELECT 1 FROM attendance_logs WHERE {where} LIMIT 1").fetchone() is None:
+                return None
+            return f"(SELECT id, user_id, timestamp, sensor_id FROM main.attendance_logs WHERE {where})"
+
+        # (archived period or None for live logs, lower, upper), newest first
+        segments = []
+        upper = None
+        for period in periods:
+            lower, period_end = period_bounds(period)
+            segments.append((None, period_end, upper))
+            segments.append((period, lower, period_end))
+            upper = lower
+        segments.append((None, "", upper))
+        if oldest_first:
+            segments.reverse()
+
+        for period, lower, upper in segments:
+            live = live_logs(lower, upper)
+            if period is None:
+                if live:
+                    yield live
+                continue
+
+            with self.partitions.attach(conn, period) as schema:
+                if live:
+                    yield (f"(SELECT id, user_id, timestamp, sensor_id FROM {schema}.attendance_logs"
+                           f" UNION ALL {live[1:-1]})")
+                else:
+                    yield f"{schema}.attendance_logs"
 
     def get_attendance_logs(self, start_date=None, end_date=None, student_filter=None) -> List[Dict]:
         """Get attendance logs with optional filters"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            return [log for logs in self.iter_attendance_logs(start_date, end_date, student_filter)
+                    for log in logs]
+        except Exception as e:
+            print(f"Database error: {e}")
+            return []
 
-            # Updated query to include all required fields
-            query = '''
-                SELECT a.id, u.name, u.school_id, u.fingerprint_id, u.profile_picture, a.timestamp
-                FROM attendance_logs a
-                JOIN users u ON a.user_id = u.id
-            '''
+    def iter_attendance_logs(self, start_date=None, end_date=None, student_filter=None,
+                             chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield filtered attendance logs, newest first, in chunks of ``chunk_size``"""
+        conditions, params = self._build_log_filters(start_date, end_date, student_filter)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
 
-            params = []
-            conditions = []
+        with self.pool.connection() as conn, \
+                closing(self._walk_log_tables(conn, start_date, end_date)) as tables:
+            for table in tables:
+                cursor = conn.execute(f'''
+                    SELECT a.id, u.name, u.school_id, u.fingerprint_id, a.timestamp, a.sensor_id
+                    FROM {table} a
+                    JOIN users u ON a.user_id = u.id{where}
+                    ORDER BY a.timestamp DESC, a.id DESC
+                ''', params)
+                try:
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield [
+                            {
+                                'id': row[0],
+                                'name': row[1],
+                                'school_id': row[2],
+                                'fingerprint_id': row[3],
+                                'timestamp': row[4],
+                                'sensor_id': row[5]
+                            }
+                            for row in rows
+                        ]
+                finally:
+                    cursor.close()
 
-            # Add date filtering
-            if start_date:
-                conditions.append("a.timestamp >= ?")
-                params.append(start_date.isoformat())
+    def get_attendance_page(self, start_date=None, end_date=None, student_filter=None,
+                            cursor: Optional[Tuple[str, int]] = None,
+                            limit: int = 200) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+        """Get one page of attendance logs, newest first, without profile pictures.
 
-            if end_date:
-                conditions.append("a.timestamp <= ?")
-                params.append(end_date.isoformat())
+        Pages are keyed on (timestamp, id): pass the returned cursor back in to
+        fetch the next page. The cursor is None once the last page has been read.
+        Use seek_attendance_cursor() to find the cursor of a page further away.
+        """
+        try:
+            conditions, params = self._build_log_filters(start_date, end_date, student_filter)
 
-            # Add student name/ID filtering
-            if student_filter:
-                conditions.append("(LOWER(u.name) LIKE ? OR LOWER(u.school_id) LIKE ?)")
-                filter_param = f"%{student_filter.lower()}%"
-                params.extend([filter_param, filter_param])
+            if cursor:
+                conditions.append("(a.timestamp, a.id) < (?, ?)")
+                params.extend(cursor)
 
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
 
-            query += " ORDER BY a.timestamp DESC"
+            rows = []
+            with self.pool.connection() as conn, closing(self._walk_log_tables(
+                    conn, start_date, end_date, cursor[0] if cursor else None)) as tables:
+                for table in tables:
+                    # Fetch one extra row to find out whether another page exists
+                    rows.extend(conn.execute(f'''
+                        SELECT a.id, u.name, u.school_id, u.fingerprint_id, a.timestamp
+                        FROM {table} a
+                        JOIN users u ON a.user_id = u.id{where}
+                        ORDER BY a.timestamp DESC, a.id DESC LIMIT ?
+                    ''', params + [limit + 1 - len(rows)]).fetchall())
+                    if len(rows) > limit:
+                        break
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
 
-            return [
+            logs = [
                 {
                     'id': row[0],
                     'name': row[1],
                     'school_id': row[2],
                     'fingerprint_id': row[3],
-                    'profile_picture': row[4],
-                    'timestamp': row[5]
+                    'timestamp': row[4]
                 }
                 for row in rows
             ]
 
+            next_cursor = (rows[-1][4], rows[-1][0]) if has_more else None
+            return logs, next_cursor
+
         except Exception as e:
             print(f"Database error: {e}")
-            return []
+            return [], None
 
-    def get_attendance_record(self, record_id: int) -> Optional[Dict]:
-        """Get a specific attendance record by ID"""
+    def seek_attendance_cursor(self, start_date=None, end_date=None, student_filter=None,
+                               cursor: Optional[Tuple[str, int]] = None, skip: int = 0,
+                               oldest_first: bool = False) -> Optional[Tuple[str, int]]:
+        """Page cursor (timestamp, id) of the log ``skip`` rows past ``cursor`` or the oldest log, else None"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            conditions, params = self._build_log_filters(start_date, end_date, student_filter)
+            if cursor:
+                conditions.append("(a.timestamp, a.id) < (?, ?)")
+                params.extend(cursor)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            order = "ASC" if oldest_first else "DESC"
 
-            cursor.execute('''
-                SELECT a.id, u.name, u.school_id, u.fingerprint_id, u.profile_picture, a.timestamp
-                FROM attendance_logs a
-                JOIN users u ON a.user_id = u.id
-                WHERE a.id = ?
-            ''', (record_id,))
+            with self.pool.connection() as conn, closing(self._walk_log_tables(
+                    conn, start_date, end_date, cursor[0] if cursor else None, oldest_first)) as tables:
+                for table in tables:
+                    found = conn.execute(f'''
+                        SELECT a.timestamp, a.id FROM {table} a{where}
+                        ORDER BY a.timestamp {order}, a.id {order} LIMIT 1 OFFSET ?
+                    ''', params + [skip]).fetchone()
+                    if found:
+                        return found[0], found[1]
+
+                    # The whole table lies within the skipped rows
+                    skip -= conn.execute(f"SELECT COUNT(*) FROM {table} a{where}", params).fetchone()[0]
+            return None
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            return None
+
+    @staticmethod
+    def _whole_days(start_date=None, end_date=None) -> Optional[Tuple[str, str]]:
+        """First and last local YYYY-MM-DD day of a range made of whole local days, else None"""
+        if start_date is not None:
+            start_date = to_local_datetime(start_date)
+            if start_date.strftime("%H:%M:%S") != "00:00:00":
+                return None
+        if end_date is not None:
+            end_date = to_local_datetime(end_date)
+            if end_date.strftime("%H:%M:%S") != "23:59:59":
+                return None
+        return (start_date.strftime("%Y-%m-%d") if start_date else "",
+                end_date.strftime("%Y-%m-%d") if end_date else "9999-12-31")
+
+    def get_attendance_summary(self, start_date=None, end_date=None, student_filter=None) -> Dict:
+        """Get total, unique-student and today's counts for the filtered logs, by local day"""
+        try:
+            now = utc_timestamp()
+            today = local_today()
+            today_start, tomorrow_start = local_day_bounds(today)
+
+            conditions, params = self._build_log_filters(start_date, end_date, student_filter)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            date_conditions, date_params = self._build_log_filters(start_date, end_date)
+            user_condition, user_params = (
+                self._student_condition("x.id", student_filter) if student_filter else ("1", []))
+            today_where = " WHERE " + " AND ".join(
+                conditions + ["a.timestamp >= ?", "a.timestamp < ?"])
+
+            # Today's count can come from the summary when the range covers all
+            # of today so far: it starts by midnight and ends no earlier than now
+            today_from_summary = (
+                not student_filter
+                and (start_date is None or to_utc_timestamp(start_date) <= today_start)
+                and (end_date is None or to_utc_timestamp(end_date) >= now)
+            )
+
+            days = self._whole_days(start_date, end_date)
+
+            with self.pool.connection() as conn:
+                total = 0
+                students = set()
+                if days is not None:
+                    if student_filter:
+                        total = conn.execute(f'''
+                            SELECT COALESCE(SUM(r.scan_count), 0)
+                            FROM users x JOIN attendance_daily_rollups r ON r.user_id = x.id
+                            WHERE {user_condition} AND r.day >= ? AND r.day <= ?
+                        ''', user_params + list(days)).fetchone()[0]
+                    else:
+                        total = conn.execute('''
+                            SELECT COALESCE(SUM(total_scans), 0) FROM attendance_daily_summary
+                            WHERE day >= ? AND day <= ?
+                        ''', days).fetchone()[0]
 
-            row = cursor.fetchone()
-            conn.close()
+                    # One primary key probe per candidate user
+                    students.update(row[0] for row in conn.execute(f'''
+                        SELECT x.id FROM users x
+                        WHERE {user_condition} AND EXISTS (
+                            SELECT 1 FROM attendance_daily_rollups r
+                            WHERE r.user_id = x.id AND r.day >= ? AND r.day <= ?
+                        )
+                    ''', user_params + list(days)))
+
+                else:
+                    with closing(self._walk_log_tables(conn, start_date, end_date)) as tables:
+                        for table in tables:
+                            total += conn.execute(
+                                f"SELECT COUNT(*) FROM {table} a{where}", params
+                            ).fetchone()[0]
+
+                            # Probe the (user_id, timestamp) index once per candidate user
+                            # instead of de-duplicating every log row
+                            students.update(row[0] for row in conn.execute(f'''
+                                SELECT x.id FROM users x
+                                WHERE {user_condition} AND EXISTS (
+                                    SELECT 1 FROM {table} a
+                                    WHERE a.user_id = x.id{"".join(" AND " + c for c in date_conditions)}
+                                )
+                            ''', user_params + date_params))
+
+                if today_from_summary:
+                    row = conn.execute(
+                        'SELECT total_scans FROM attendance_daily_summary WHERE day = ?', (today,)
+                    ).fetchone()
+                    today_count = row[0] if row else 0
+                else:
+                    today_count = conn.execute(
+                        f"SELECT COUNT(*) FROM attendance_logs a{today_where}",
+                        params + [today_start, tomorrow_start]
+                    ).fetchone()[0]
+
+            return {
+                'total': total,
+                'unique_students': len(students),
+                'today': today_count
+            }
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            return {'total': 0, 'unique_students': 0, 'today': 0}
+
+    def get_attendance_record(self, record_id: int) -> Optional[Dict]:
+        """Get a specific attendance record by ID, looking in the archives if needed"""
+        query = '''
+            SELECT a.id, u.name, u.school_id, u.fingerprint_id, a.timestamp, a.user_id
+            FROM {table} a
+            JOIN users u ON a.user_id = u.id
+            WHERE a.id = ?
+        '''
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(query.format(table="main.attendance_logs"), (record_id,)).fetchone()
+
+                if row is None:
+                    # Archived logs keep their ids, so each partition covers one id range
+                    partition = conn.execute(
+                        'SELECT period FROM attendance_partitions WHERE min_id <= ? AND max_id >= ?',
+                        (record_id, record_id)
+                    ).fetchone()
+                    if partition:
+                        with self.partitions.attach(conn, partition[0]) as schema:
+                            row = conn.execute(
+                                query.format(table=f"{schema}.attendance_logs"), (record_id,)
+                            ).fetchone()
 
             if row:
                 return {
@@ -194,8 +950,8 @@ class DatabaseManager:
                     'name': row[1],
                     'school_id': row[2],
                     'fingerprint_id': row[3],
-                    'profile_picture': row[4],
-                    'timestamp': row[5]
+                    'timestamp': row[4],
+                    'user_id': row[5]
                 }
             return None
 
@@ -203,17 +959,51 @@ class DatabaseManager:
             print(f"Database error: {e}")
             return None
 
+    @staticmethod
+    def _in_partition(cursor, record_id: int) -> bool:
+        """Whether an id missing from attendance_logs belongs to an archived month"""
+        return cursor.execute(
+            'SELECT 1 FROM attendance_partitions WHERE min_id <= ? AND max_id >= ?',
+            (record_id, record_id)
+        ).fetchone() is not None
+
+    def is_archived_record(self, record_id: int) -> bool:
+        """Whether an attendance record is archived, and so read-only"""
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                if cursor.execute('SELECT 1 FROM attendance_logs WHERE id = ?', (record_id,)).fetchone():
+                    return False
+                return self._in_partition(cursor, record_id)
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+
     def delete_attendance_record(self, record_id: int) -> bool:
-        """Delete an attendance record"""
+        """Delete an attendance record; archived records are read-only"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('DELETE FROM attendance_logs WHERE id = ?', (record_id,))
+                row = cursor.execute(
+                    'SELECT user_id, timestamp FROM attendance_logs WHERE id = ?', (record_id,)
+                ).fetchone()
+                if row is None and self._in_partition(cursor, record_id):
+                    print(f"Attendance record {record_id} is archived; archived records are read-only")
+                    return False
+                cursor.execute('DELETE FROM attendance_logs WHERE id = ?', (record_id,))
 
-            success = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+                success = cursor.rowcount > 0
+                if success:
+                    user_id, timestamp = row
+                    day = to_local(timestamp)[:10]
+                    self._unroll_attendance(cursor, user_id, timestamp)
+                    cursor.execute('''
+                        UPDATE attendance_daily_summary
+                        SET total_scans = total_scans - 1, unique_users = unique_users - ?
+                        WHERE day = ?
+                    ''', (0 if self._user_logged_on(cursor, user_id, day) else 1, day))
+                conn.commit()
 
             return success
 
@@ -224,17 +1014,16 @@ class DatabaseManager:
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                SELECT fingerprint_id, name, school_id
-                FROM users
-                ORDER BY name
-            ''')
+                cursor.execute('''
+                    SELECT fingerprint_id, name, school_id
+                    FROM users
+                    ORDER BY name
+                ''')
 
-            rows = cursor.fetchall()
-            conn.close()
+                rows = cursor.fetchall()
 
             return [
                 {
@@ -252,12 +1041,11 @@ class DatabaseManager:
     def fingerprint_id_exists(self, fingerprint_id: int) -> bool:
         """Check if fingerprint ID already exists"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('SELECT 1 FROM users WHERE fingerprint_id = ?', (fingerprint_id,))
-            result = cursor.fetchone()
-            conn.close()
+                cursor.execute('SELECT 1 FROM users WHERE fingerprint_id = ?', (fingerprint_id,))
+                result = cursor.fetchone()
 
             return result is not None
 
@@ -268,15 +1056,14 @@ class DatabaseManager:
     def school_id_exists(self, school_id: str) -> bool:
         """Check if school ID already exists"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('SELECT 1 FROM users WHERE school_id = ?', (school_id,))
-            result = cursor.fetchone()
-            conn.close()
+                cursor.execute('SELECT 1 FROM users WHERE school_id = ?', (school_id,))
+                result = cursor.fetchone()
 
             return result is not None
 
         except Exception as e:
             print(f"Database error: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,260 @@
+import sqlite3
+import hashlib
+from typing import Callable, List, Tuple
+
+
+def _add_attendance_indexes(cursor: sqlite3.Cursor):
+    """Index attendance logs for date-range filters and per-user lookups"""
+    # (timestamp) implicitly carries the rowid, so it also serves ORDER BY timestamp, id
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_attendance_logs_timestamp
+        ON attendance_logs (timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_attendance_logs_user_timestamp
+        ON attendance_logs (user_id, timestamp)
+    ''')
+
+
+def _add_user_thumbnails(cursor: sqlite3.Cursor):
+    """Store pre-rendered profile picture thumbnails per user and size"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_thumbnails (
+            user_id INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            image BLOB NOT NULL,
+            PRIMARY KEY (user_id, size),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+
+def _move_profile_pictures(cursor: sqlite3.Cursor):
+    """Move profile picture BLOBs out of users into content-addressed storage.
+
+    users.profile_picture is left in place but emptied, since dropping a
+    column needs a table rebuild on older SQLite versions.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS profile_images (
+            hash TEXT PRIMARY KEY,
+            image BLOB NOT NULL
+        )
+    ''')
+    cursor.execute('ALTER TABLE users ADD COLUMN profile_image_hash TEXT')
+
+    # Load one BLOB at a time so large rosters do not have to fit in memory
+    user_ids = [row[0] for row in cursor.execute(
+        'SELECT id FROM users WHERE profile_picture IS NOT NULL'
+    ).fetchall()]
+
+    for user_id in user_ids:
+        image = cursor.execute(
+            'SELECT profile_picture FROM users WHERE id = ?', (user_id,)
+        ).fetchone()[0]
+        image_hash = hashlib.sha256(image).hexdigest()
+
+        cursor.execute(
+            'INSERT OR IGNORE INTO profile_images (hash, image) VALUES (?, ?)',
+            (image_hash, image)
+        )
+        cursor.execute(
+            'UPDATE users SET profile_image_hash = ?, profile_picture = NULL WHERE id = ?',
+            (image_hash, user_id)
+        )
+
+
+def _add_attendance_sensor_id(cursor: sqlite3.Cursor):
+    """Record which sensor/door each attendance log came from"""
+    cursor.execute('ALTER TABLE attendance_logs ADD COLUMN sensor_id TEXT')
+
+
+def _add_daily_summary(cursor: sqlite3.Cursor):
+    """Keep per-day scan and student counts so stats never scan attendance_logs"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_daily_summary (
+            day TEXT PRIMARY KEY,
+            total_scans INTEGER NOT NULL DEFAULT 0,
+            unique_users INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO attendance_daily_summary (day, total_scans, unique_users)
+        SELECT substr(timestamp, 1, 10), COUNT(*), COUNT(DISTINCT user_id)
+        FROM attendance_logs
+        GROUP BY substr(timestamp, 1, 10)
+    ''')
+
+
+def _add_users_fts(cursor: sqlite3.Cursor):
+    """Index user names and school IDs for substring search.
+
+    Uses an FTS5 trigram index kept in sync with users by triggers. SQLite
+    builds without FTS5 or the trigram tokenizer (before 3.34) skip this, and
+    DatabaseManager falls back to LIKE over the users table.
+    """
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE users_fts USING fts5(
+                name, school_id,
+                content='users', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Student search index not available, using LIKE instead: {e}")
+        return
+
+    cursor.execute('''
+        CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts (rowid, name, school_id) VALUES (new.id, new.name, new.school_id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, name, school_id)
+            VALUES ('delete', old.id, old.name, old.school_id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER users_fts_update AFTER UPDATE OF name, school_id ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, name, school_id)
+            VALUES ('delete', old.id, old.name, old.school_id);
+            INSERT INTO users_fts (rowid, name, school_id) VALUES (new.id, new.name, new.school_id);
+        END
+    ''')
+    cursor.execute("INSERT INTO users_fts (users_fts) VALUES ('rebuild')")
+
+
+def _add_attendance_partitions(cursor: sqlite3.Cursor):
+    """Register months of attendance logs moved into archive files"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_partitions (
+            period TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            min_id INTEGER,
+            max_id INTEGER,
+            min_timestamp TEXT,
+            max_timestamp TEXT,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _add_daily_rollups(cursor: sqlite3.Cursor):
+    """Keep each user's first and last scan and scan count per day for reports.
+
+    Only logs still in attendance_logs are backfilled; archived months are
+    added by DatabaseManager.rebuild_rollups().
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_daily_rollups (
+            user_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            first_scan TEXT NOT NULL,
+            last_scan TEXT NOT NULL,
+            scan_count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_attendance_daily_rollups_day
+        ON attendance_daily_rollups (day, user_id)
+    ''')
+    cursor.execute('''
+        INSERT INTO attendance_daily_rollups (user_id, day, first_scan, last_scan, scan_count)
+        SELECT user_id, substr(timestamp, 1, 10), MIN(timestamp), MAX(timestamp), COUNT(*)
+        FROM attendance_logs
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, substr(timestamp, 1, 10)
+    ''')
+
+
+def _key_days_locally(cursor: sqlite3.Cursor):
+    """Recount the day tables by local day, with first and last scans in local time.
+
+    Only attendance_logs is read here; DatabaseManager counts archived
+    months in once the migration has run.
+    """
+    cursor.execute('DELETE FROM attendance_daily_rollups')
+    cursor.execute('''
+        INSERT INTO attendance_daily_rollups (user_id, day, first_scan, last_scan, scan_count)
+        SELECT user_id, date(timestamp, 'localtime'),
+               datetime(MIN(timestamp), 'localtime'), datetime(MAX(timestamp), 'localtime'), COUNT(*)
+        FROM attendance_logs
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, date(timestamp, 'localtime')
+    ''')
+    cursor.execute('DELETE FROM attendance_daily_summary')
+    cursor.execute('''
+        INSERT INTO attendance_daily_summary (day, total_scans, unique_users)
+        SELECT day, SUM(scan_count), COUNT(*)
+        FROM attendance_daily_rollups
+        GROUP BY day
+    ''')
+
+
+# Ordered list of (version, description, migration). Append new migrations at
+# the end with the next version number; never edit one that has shipped.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "Index attendance_logs by timestamp and by user", _add_attendance_indexes),
+    (2, "Add user_thumbnails table", _add_user_thumbnails),
+    (3, "Move profile pictures into profile_images", _move_profile_pictures),
+    (4, "Add attendance_logs.sensor_id", _add_attendance_sensor_id),
+    (5, "Add attendance_daily_summary table", _add_daily_summary),
+    (6, "Add users_fts search index", _add_users_fts),
+    (7, "Add attendance_partitions registry", _add_attendance_partitions),
+    (8, "Add attendance_daily_rollups table", _add_daily_rollups),
+    (9, "Key daily summary and rollups by local day", _key_days_locally),
+]
+
+LOCAL_DAYS_VERSION = 9  # Day tables from before this version counted UTC days
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied migration version"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration, each in its own transaction.
+
+    Returns the schema version after migrating.
+    """
+    current = get_schema_version(conn)
+    applied = False
+
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migrate(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                (version, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        print(f"Applied database migration {version}: {description}")
+        applied = True
+        current = version
+
+    if applied:
+        # Refresh planner statistics so the new indexes get picked up
+        conn.execute("PRAGMA optimize")
+
+    return current
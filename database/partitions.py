@@ -0,0 +1,229 @@
+"""Monthly archive partitions for attendance logs.
+
+Closed months can be moved out of attendance_logs into one SQLite file per
+month, gzip-compressed and read-only, e.g. ``archive/attendance_2024-09.db.gz``.
+The attendance_partitions table records each file with its id and timestamp
+range. A query whose date range reaches an archived month decompresses that
+file once into ``archive/.cache`` and ATTACHes it read-only for the duration
+of the query, so queries on the current term never open the archives.
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Tuple
+from urllib.request import pathname2url
+
+from database.timestamps import local_day_bounds, local_today
+
+
+# Schema of each partition file: attendance_logs with its original ids
+PARTITION_SCHEMA = [
+    '''
+        CREATE TABLE IF NOT EXISTS attendance_logs (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            timestamp TIMESTAMP,
+            sensor_id TEXT
+        )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_logs_timestamp ON attendance_logs (timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_logs_user_timestamp ON attendance_logs (user_id, timestamp)',
+]
+
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+COMPRESS_LEVEL = 6
+COPY_BUFFER = 1 << 20
+
+
+def period_bounds(period: str) -> Tuple[str, str]:
+    """Timestamp range [start, end) covering a YYYY-MM month"""
+    year, month = map(int, period.split("-"))
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{period}-01", f"{next_year:04d}-{next_month:02d}-01"
+
+
+def _replace_read_only(source: str, target: str):
+    """Move ``source`` over ``target`` and make it read-only"""
+    if os.path.exists(target):
+        os.chmod(target, stat.S_IRUSR | stat.S_IWUSR)  # Windows cannot replace read-only files
+    os.chmod(source, READ_ONLY)
+    os.replace(source, target)
+
+
+class PartitionStore:
+    """Archive files of the attendance partitions and their decompressed cache"""
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.cache_dir = os.path.join(archive_dir, ".cache")
+        self._lock = threading.Lock()
+
+    def archive_path(self, period: str) -> str:
+        return os.path.join(self.archive_dir, f"attendance_{period}.db.gz")
+
+    def source_path(self, conn: sqlite3.Connection, period: str) -> str:
+        """Archive file of a partition: the registered path, else this store's"""
+        row = conn.execute(
+            'SELECT path FROM attendance_partitions WHERE period = ?', (period,)).fetchone()
+        if row and os.path.exists(row[0]):
+            return row[0]
+        return self.archive_path(period)
+
+    def cached_path(self, period: str, source: str) -> str:
+        """Decompressed copy of the partition archive ``source``, refreshed when it changes"""
+        target = os.path.join(self.cache_dir, f"attendance_{period}.db")
+
+        with self._lock:
+            if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, partial = tempfile.mkstemp(suffix=".part", dir=self.cache_dir)
+                try:
+                    with gzip.open(source, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFFER)
+                    _replace_read_only(partial, target)
+                except BaseException:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                    raise
+        return target
+
+    @contextmanager
+    def attach(self, conn: sqlite3.Connection, period: str, schema: str = "archive"):
+        """ATTACH a partition read-only to ``conn`` as ``schema`` inside the block.
+
+        ``conn`` must be opened with uri=True, as the pooled connections are.
+        Cursors on the partition have to be closed before the block ends.
+        """
+        path = os.path.abspath(self.cached_path(period, self.source_path(conn, period)))
+        conn.execute(f"ATTACH DATABASE ? AS {schema}",
+                     ("file:" + pathname2url(path) + "?mode=ro&immutable=1",))
+        try:
+            yield schema
+        finally:
+            conn.execute(f"DETACH DATABASE {schema}")
+
+    def compress(self, source: str, period: str) -> str:
+        """Gzip a partition database into its read-only archive file"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        target = self.archive_path(period)
+        fd, partial = tempfile.mkstemp(suffix=".part", dir=self.archive_dir)
+        try:
+            with open(source, 'rb') as src, os.fdopen(fd, 'wb') as raw, \
+                    gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=COMPRESS_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER)
+            _replace_read_only(partial, target)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return target
+
+
+def archive_month(db, period: str) -> Dict:
+    """Move one month of attendance logs from attendance_logs into its partition.
+
+    Logs are copied into a partition database (merged with the existing
+    archive for that month, if any), which is compressed and registered
+    before the logs are deleted from attendance_logs. Daily summary counts
+    are kept, so totals still include archived logs.
+    """
+    store = db.partitions
+    start, end = period_bounds(period)
+    os.makedirs(store.archive_dir, exist_ok=True)
+    fd, work_path = tempfile.mkstemp(suffix=".db", dir=store.archive_dir)
+    os.close(fd)
+
+    try:
+        # Merge with the month's existing archive, wherever it was registered
+        with db.pool.connection() as conn:
+            existing = store.source_path(conn, period)
+        if os.path.exists(existing):
+            with gzip.open(existing, 'rb') as src, open(work_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER)
+
+        part = sqlite3.connect(work_path)
+        try:
+            for statement in PARTITION_SCHEMA:
+                part.execute(statement)
+            part.commit()
+        finally:
+            part.close()
+
+        with db.pool.connection() as conn:
+            # Only move logs that exist now, in case the writer adds more
+            last_id = conn.execute('SELECT MAX(id) FROM attendance_logs').fetchone()[0] or 0
+
+            conn.execute("ATTACH DATABASE ? AS archive", (work_path,))
+            try:
+                conn.execute('''
+                    INSERT OR IGNORE INTO archive.attendance_logs (id, user_id, timestamp, sensor_id)
+                    SELECT id, user_id, timestamp, sensor_id FROM main.attendance_logs
+                    WHERE timestamp >= ? AND timestamp < ? AND id <= ?
+                    ORDER BY id
+                ''', (start, end, last_id))
+                conn.commit()
+                row_count, min_id, max_id, min_timestamp, max_timestamp = conn.execute('''
+                    SELECT COUNT(*), MIN(id), MAX(id), MIN(timestamp), MAX(timestamp)
+                    FROM archive.attendance_logs
+                ''').fetchone()
+            finally:
+                conn.execute("DETACH DATABASE archive")
+
+        part = sqlite3.connect(work_path)
+        try:
+            part.execute("VACUUM")
+        finally:
+            part.close()
+        # Registered absolute, so managers with another archive_dir or cwd still find it
+        path = os.path.abspath(store.compress(work_path, period))
+
+        with db.pool.connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO attendance_partitions
+                    (period, path, row_count, min_id, max_id, min_timestamp, max_timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (period, path, row_count, min_id, max_id, min_timestamp, max_timestamp))
+            moved = conn.execute(
+                'DELETE FROM attendance_logs WHERE timestamp >= ? AND timestamp < ? AND id <= ?',
+                (start, end, last_id)
+            ).rowcount
+            conn.commit()
+
+        return {'period': period, 'path': path, 'moved': moved, 'row_count': row_count}
+
+    finally:
+        if os.path.exists(work_path):
+            os.remove(work_path)
+
+
+def archive_before(db, before: str, vacuum: bool = False) -> List[Dict]:
+    """Archive every month of attendance logs before ``before`` (YYYY-MM).
+
+    Use the first month of the current term to archive all closed terms.
+    Running it again also sweeps up logs added to already archived months.
+    ``vacuum`` shrinks the main database file afterwards.
+    """
+    datetime.strptime(before, "%Y-%m")  # Raises ValueError for a malformed month
+    # Today's logs stay live; east of UTC the local day can start in the previous UTC month
+    if before > local_day_bounds(local_today())[0][:7]:
+        raise ValueError(f"Only closed months can be archived, not {before}")
+
+    with db.pool.connection() as conn:
+        periods = [row[0] for row in conn.execute('''
+            SELECT DISTINCT substr(timestamp, 1, 7) FROM attendance_logs
+            WHERE timestamp < ? ORDER BY 1
+        ''', (f"{before}-01",))]
+
+    results = [archive_month(db, period) for period in periods]
+
+    if vacuum and results:
+        with db.pool.connection() as conn:
+            conn.execute("VACUUM")
+
+    return results
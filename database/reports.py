@@ -0,0 +1,155 @@
+"""Attendance reports answered from attendance_daily_rollups.
+
+Each student has one rollup row per day they attended, with their first and
+last scan and scan count, so these reports read a few rows per student
+instead of scanning attendance logs, and cover archived months too. Days are
+local "YYYY-MM-DD" strings and first and last scans local times, in the
+timezone of the machine running the app (see database.timestamps), so a
+cutoff of "08:00" means 08:00 at the school. A school day is a day with at
+least one scan.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def _seconds(time_of_day: str) -> int:
+    """Seconds since midnight of an "HH:MM:SS" time"""
+    return int(time_of_day[:2]) * 3600 + int(time_of_day[3:5]) * 60 + int(time_of_day[6:8])
+
+
+def _user_condition(db, student_filter: Optional[str]):
+    if not student_filter:
+        return "1", []
+    return db._student_condition("u.id", student_filter)
+
+
+def school_days(db, start_day: str, end_day: str) -> List[str]:
+    """Days between start_day and end_day, inclusive, on which anyone scanned"""
+    try:
+        with db.pool.connection() as conn:
+            return [row[0] for row in conn.execute('''
+                SELECT day FROM attendance_daily_summary
+                WHERE day >= ? AND day <= ? AND total_scans > 0
+                ORDER BY day
+            ''', (start_day, end_day))]
+    except Exception as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def attendees(db, day: str, student_filter: Optional[str] = None) -> List[Dict]:
+    """Students who scanned on ``day``, in order of arrival"""
+    condition, params = _user_condition(db, student_filter)
+    try:
+        with db.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT u.id, u.name, u.school_id, r.first_scan, r.last_scan, r.scan_count
+                FROM attendance_daily_rollups r
+                JOIN users u ON r.user_id = u.id
+                WHERE r.day = ? AND {condition}
+                ORDER BY r.first_scan
+            ''', [day] + params).fetchall()
+    except Exception as e:
+        print(f"Database error: {e}")
+        return []
+
+    return [
+        {
+            'user_id': row[0],
+            'name': row[1],
+            'school_id': row[2],
+            'first_scan': row[3],
+            'last_scan': row[4],
+            'scan_count': row[5]
+        }
+        for row in rows
+    ]
+
+
+def absentees(db, day: str, student_filter: Optional[str] = None) -> List[Dict]:
+    """Enrolled students who did not scan on ``day``, by name"""
+    condition, params = _user_condition(db, student_filter)
+    try:
+        with db.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT u.id, u.name, u.school_id
+                FROM users u
+                WHERE {condition} AND NOT EXISTS (
+                    SELECT 1 FROM attendance_daily_rollups r
+                    WHERE r.user_id = u.id AND r.day = ?
+                )
+                ORDER BY u.name
+            ''', params + [day]).fetchall()
+    except Exception as e:
+        print(f"Database error: {e}")
+        return []
+
+    return [{'user_id': row[0], 'name': row[1], 'school_id': row[2]} for row in rows]
+
+
+def attendance_rates(db, start_day: str, end_day: str,
+                     student_filter: Optional[str] = None) -> List[Dict]:
+    """Share of school days each student attended between start_day and end_day.
+
+    ``rate`` is None when there were no school days in the range.
+    """
+    days = len(school_days(db, start_day, end_day))
+    condition, params = _user_condition(db, student_filter)
+    try:
+        with db.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT u.id, u.name, u.school_id, COUNT(r.day)
+                FROM users u
+                LEFT JOIN attendance_daily_rollups r
+                    ON r.user_id = u.id AND r.day >= ? AND r.day <= ?
+                WHERE {condition}
+                GROUP BY u.id
+                ORDER BY u.name
+            ''', [start_day, end_day] + params).fetchall()
+    except Exception as e:
+        print(f"Database error: {e}")
+        return []
+
+    return [
+        {
+            'user_id': row[0],
+            'name': row[1],
+            'school_id': row[2],
+            'days_present': row[3],
+            'school_days': days,
+            'rate': row[3] / days if days else None
+        }
+        for row in rows
+    ]
+
+
+def late_arrivals(db, start_day: str, end_day: Optional[str] = None, cutoff: str = "08:00",
+                  student_filter: Optional[str] = None) -> List[Dict]:
+    """First scans after ``cutoff`` (HH:MM or HH:MM:SS, local time) on each day in the range"""
+    cutoff_time = datetime.strptime(
+        cutoff, "%H:%M:%S" if cutoff.count(":") == 2 else "%H:%M").strftime("%H:%M:%S")
+    condition, params = _user_condition(db, student_filter)
+    try:
+        with db.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT u.id, u.name, u.school_id, r.day, r.first_scan
+                FROM attendance_daily_rollups r
+                JOIN users u ON r.user_id = u.id
+                WHERE r.day >= ? AND r.day <= ? AND substr(r.first_scan, 12) > ? AND {condition}
+                ORDER BY r.day, r.first_scan
+            ''', [start_day, end_day or start_day, cutoff_time] + params).fetchall()
+    except Exception as e:
+        print(f"Database error: {e}")
+        return []
+
+    return [
+        {
+            'user_id': row[0],
+            'name': row[1],
+            'school_id': row[2],
+            'day': row[3],
+            'first_scan': row[4],
+            'minutes_late': (_seconds(row[4][11:19]) - _seconds(cutoff_time)) // 60
+        }
+        for row in rows
+    ]
@@ -0,0 +1,262 @@
+"""Bulk roster import for enrolling many students at once.
+
+The roster is a CSV file with a header row and these columns, in any order:
+
+    fingerprint_id, name, school_id, photo
+
+``photo`` is optional and names a file in the photo folder. Without it, a
+photo named after the school ID (e.g. ``S-00042.jpg``) is used if there is
+one. Rows are checked against the enrolled students and each other before
+anything is written, photos are shrunk and thumbnailed on a process pool,
+and all valid students are added in one transaction. Fingerprints are then
+enrolled on the sensor under the same IDs, from the Enrollment screen.
+
+Run from the repository root:
+
+    python -m database.roster_import roster.csv --photos photos/ --errors errors.csv
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database.thumbnails import make_thumbnails
+
+
+ROSTER_COLUMNS = ['fingerprint_id', 'name', 'school_id', 'photo']
+REQUIRED_COLUMNS = ['fingerprint_id', 'name', 'school_id']
+ERROR_COLUMNS = ['row', 'fingerprint_id', 'name', 'school_id', 'error']
+FINGERPRINT_IDS = range(1, 128)  # IDs the sensor accepts, as in EnrollmentFrame
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+MAX_PHOTO_SIZE = 512  # Longest side, in pixels, of stored profile pictures
+
+
+def prepare_photo(path: str) -> Tuple[bytes, Dict[int, bytes]]:
+    """Read a photo, shrink it for storage and render its thumbnails.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    # Imported here so PIL is only loaded in the worker processes
+    from PIL import Image
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    with Image.open(path) as image:
+        if max(image.size) > MAX_PHOTO_SIZE:
+            image.thumbnail((MAX_PHOTO_SIZE, MAX_PHOTO_SIZE), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=90)
+            data = output.getvalue()
+
+    return data, make_thumbnails(data)
+
+
+def _photo_index(photo_dir: Optional[str]) -> Dict[str, str]:
+    """Lower-cased file name and stem -> path of each image in the photo folder"""
+    index = {}
+    if not photo_dir:
+        return index
+    for filename in os.listdir(photo_dir):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() in IMAGE_EXTENSIONS:
+            path = os.path.join(photo_dir, filename)
+            index[filename.lower()] = path
+            index.setdefault(stem.lower(), path)
+    return index
+
+
+def load_roster(db, csv_path: str, photo_dir: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+    """Read and validate a roster CSV.
+
+    Returns (students, errors). Each student dict has row, fingerprint_id,
+    name, school_id and photo_path (or None); each error has row,
+    fingerprint_id, name, school_id and error. Row numbers count the header
+    as line 1, as spreadsheets do. IDs are checked against sets of the
+    enrolled IDs and of the rows accepted so far, without database queries.
+    """
+    enrolled_fingerprints, enrolled_school_ids = db.get_enrolled_ids()
+    seen_fingerprints, seen_school_ids = set(), set()
+    photos = _photo_index(photo_dir)
+    students, errors = [], []
+
+    # utf-8-sig skips the byte order mark Excel writes
+    with open(csv_path, newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.DictReader(csvfile)
+        columns = {(name or "").strip().lower(): name for name in reader.fieldnames or []}
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"Roster is missing column(s): {', '.join(missing)}")
+
+        for row in reader:
+            row_number = reader.line_num
+            values = {column: (row.get(columns[column]) or "").strip()
+                      for column in ROSTER_COLUMNS if column in columns}
+            if not any(values.values()):
+                continue  # Blank line
+
+            def reject(message):
+                errors.append({'row': row_number, 'fingerprint_id': values['fingerprint_id'],
+                               'name': values['name'], 'school_id': values['school_id'],
+                               'error': message})
+
+            name, school_id = values['name'], values['school_id']
+            if not name:
+                reject("Missing name")
+                continue
+            if not school_id:
+                reject("Missing school ID")
+                continue
+            try:
+                fingerprint_id = int(values['fingerprint_id'])
+            except ValueError:
+                reject("Fingerprint ID must be a number")
+                continue
+            if fingerprint_id not in FINGERPRINT_IDS:
+                reject(f"Fingerprint ID must be between {FINGERPRINT_IDS[0]} and {FINGERPRINT_IDS[-1]}")
+                continue
+
+            if fingerprint_id in enrolled_fingerprints:
+                reject(f"Fingerprint ID {fingerprint_id} already exists")
+                continue
+            if fingerprint_id in seen_fingerprints:
+                reject(f"Fingerprint ID {fingerprint_id} appears more than once")
+                continue
+            if school_id in enrolled_school_ids:
+                reject(f"School ID {school_id} already exists")
+                continue
+            if school_id in seen_school_ids:
+                reject(f"School ID {school_id} appears more than once")
+                continue
+
+            photo = values.get('photo')
+            if photo:
+                photo_path = photos.get(photo.lower())
+                if photo_path is None:
+                    reject(f"Photo {photo} not found")
+                    continue
+            else:
+                photo_path = photos.get(school_id.lower())
+
+            seen_fingerprints.add(fingerprint_id)
+            seen_school_ids.add(school_id)
+            students.append({'row': row_number, 'fingerprint_id': fingerprint_id, 'name': name,
+                             'school_id': school_id, 'photo_path': photo_path})
+
+    return students, errors
+
+
+def import_roster(db, students: List[Dict],
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  max_workers: Optional[int] = None) -> Dict:
+    """Prepare photos for validated students and add them all in one transaction.
+
+    ``progress(done)`` is called as each student's photo is ready. A student
+    whose photo cannot be read is reported and left out; everyone else is
+    added. Setting ``cancel_event`` stops before anything is saved. Returns
+    {'imported': count, 'errors': [...], 'cancelled': bool}, with errors in
+    the same form as load_roster's.
+    """
+    errors = []
+    ready = [dict(student) for student in students if not student['photo_path']]
+    with_photos = [dict(student) for student in students if student['photo_path']]
+    done = len(ready)
+    if progress:
+        progress(done)
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    if with_photos and not cancelled():
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(prepare_photo, student['photo_path']): student
+                       for student in with_photos}
+            for future in as_completed(futures):
+                if cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+                student = futures[future]
+                try:
+                    student['photo'], student['thumbnails'] = future.result()
+                    ready.append(student)
+                except Exception as e:
+                    errors.append({'row': student['row'], 'fingerprint_id': student['fingerprint_id'],
+                                   'name': student['name'], 'school_id': student['school_id'],
+                                   'error': f"Could not read photo {os.path.basename(student['photo_path'])}: {e}"})
+                done += 1
+                if progress:
+                    progress(done)
+
+    if cancelled():
+        return {'imported': 0, 'errors': errors, 'cancelled': True}
+
+    ready.sort(key=lambda student: student['row'])
+    if ready and not db.add_users(ready):
+        errors.extend({'row': student['row'], 'fingerprint_id': student['fingerprint_id'],
+                       'name': student['name'], 'school_id': student['school_id'],
+                       'error': "Could not save to the database"} for student in ready)
+        ready = []
+
+    errors.sort(key=lambda error: error['row'])
+    return {'imported': len(ready), 'errors': errors, 'cancelled': False}
+
+
+def write_error_report(path: str, errors: List[Dict]):
+    """Save per-row import errors as a CSV file"""
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=ERROR_COLUMNS)
+        writer.writeheader()
+        writer.writerows(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add the students of a roster CSV to the database")
+    parser.add_argument("roster", help="CSV with fingerprint_id, name, school_id and optional photo columns")
+    parser.add_argument("--photos", default=None, help="folder with the students' photos")
+    parser.add_argument("--db", default="attendance.db", help="path to the SQLite database")
+    parser.add_argument("--errors", default=None, help="write rows that were not imported to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="only validate the roster")
+    args = parser.parse_args()
+
+    # Imported here so worker processes do not open the database
+    from database.db_manager import DatabaseManager
+
+    db = DatabaseManager(args.db)
+    try:
+        try:
+            students, errors = load_roster(db, args.roster, args.photos)
+        except (OSError, ValueError) as e:
+            sys.exit(str(e))
+
+        imported = 0
+        if students and not args.dry_run:
+            result = import_roster(
+                db, students,
+                progress=lambda done: print(f"\r{done:,}/{len(students):,} students", end="", file=sys.stderr)
+            )
+            print(file=sys.stderr)
+            imported = result['imported']
+            errors = sorted(errors + result['errors'], key=lambda error: error['row'])
+    finally:
+        db.close()
+
+    for error in errors:
+        print(f"Row {error['row']}: {error['error']}", file=sys.stderr)
+    if args.errors and errors:
+        write_error_report(args.errors, errors)
+
+    if args.dry_run:
+        print(f"{len(students):,} students ready to import, {len(errors):,} rows with errors")
+    else:
+        print(f"Imported {imported:,} students, {len(errors):,} rows with errors")
+
+
+if __name__ == "__main__":
+    main()
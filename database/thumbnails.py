@@ -0,0 +1,27 @@
+import io
+from typing import Dict, Iterable
+
+
+# Square sizes (in pixels) the UI displays profile pictures at:
+# 80 for the detection panel, 100 for the record details dialog
+THUMBNAIL_SIZES = (80, 100)
+
+
+def make_thumbnail(image_data: bytes, size: int) -> bytes:
+    """Resize an encoded image to a size x size PNG"""
+    # Imported here so the headless daemon never loads PIL
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    image = image.resize((size, size), Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def make_thumbnails(image_data: bytes, sizes: Iterable[int] = THUMBNAIL_SIZES) -> Dict[int, bytes]:
+    """Render thumbnails of an encoded image at every requested size"""
+    return {size: make_thumbnail(image_data, size) for size in sizes}
@@ -0,0 +1,50 @@
+"""Stored timestamps and the local days they fall on.
+
+Attendance logs store UTC "YYYY-MM-DD HH:MM:SS" strings, like SQLite's
+CURRENT_TIMESTAMP. Days, on the other hand, are local calendar days of the
+machine running the app: the daily summary, the rollups, the reports and
+"today" all start at local midnight, so a 07:30 scan counts on the day it
+happened wherever the school is. SQLite's 'localtime' modifier converts the
+same way inside queries.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def utc_timestamp() -> str:
+    """Current time in the format SQLite's CURRENT_TIMESTAMP stores"""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def to_utc_timestamp(value: datetime) -> str:
+    """Stored form of ``value``; naive datetimes are taken to be UTC already"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def to_local(timestamp: str) -> str:
+    """Local "YYYY-MM-DD HH:MM:SS" time of a stored UTC timestamp"""
+    utc = datetime.strptime(timestamp[:19], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return utc.astimezone().strftime(TIMESTAMP_FORMAT)
+
+
+def to_local_datetime(value: datetime) -> datetime:
+    """Naive local time of ``value``; naive datetimes are taken to be UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone().replace(tzinfo=None)
+
+
+def local_today() -> str:
+    """Today's local YYYY-MM-DD day"""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def local_day_bounds(day: str) -> Tuple[str, str]:
+    """Stored timestamp range [start, end) covering the local YYYY-MM-DD day"""
+    start = datetime.strptime(day, "%Y-%m-%d")
+    return (to_utc_timestamp(start.astimezone()),
+            to_utc_timestamp((start + timedelta(days=1)).astimezone()))
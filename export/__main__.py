@@ -0,0 +1,60 @@
+"""Export attendance logs from the command line.
+
+Run from the repository root:
+
+    python -m export --output attendance.parquet
+    python -m export --format csv.gz --start 2024-01-01 --end 2024-12-31 --output 2024.csv.gz
+    python -m export --format parquet --partition month --output exports/
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from database.db_manager import DatabaseManager
+from export.formats import FORMATS, PARTITIONS, available_formats, export_logs, format_for_path
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export attendance logs for analytics")
+    parser.add_argument("--db", default="attendance.db", help="path to the SQLite database")
+    parser.add_argument("--output", required=True,
+                        help="output file, or directory when partitioning")
+    parser.add_argument("--format", choices=list(FORMATS), default=None,
+                        help=f"default: from the output name, else {available_formats()[0]}")
+    parser.add_argument("--start", type=parse_date, help="first day to export (YYYY-MM-DD, UTC)")
+    parser.add_argument("--end", type=parse_date, help="last day to export (YYYY-MM-DD, UTC)")
+    parser.add_argument("--student", default=None, help="only logs of students matching this name or ID")
+    parser.add_argument("--partition", choices=list(PARTITIONS), default=None,
+                        help="write one file per month or day")
+    args = parser.parse_args()
+
+    file_format = args.format or format_for_path(args.output) or available_formats()[0]
+    if file_format not in available_formats():
+        needs = "pyarrow" if file_format in ("parquet", "arrow") else "zstandard"
+        sys.exit(f"Format {file_format} needs {needs}; install it "
+                 f"or use one of: {', '.join(available_formats())}")
+
+    # Include the whole of the last day
+    end = args.end.replace(hour=23, minute=59, second=59) if args.end else None
+
+    db = DatabaseManager(args.db)
+    try:
+        written = export_logs(
+            db, args.output, file_format,
+            start_date=args.start, end_date=end,
+            student_filter=args.student.lower() if args.student else None,
+            partition=args.partition,
+            progress=lambda rows: print(f"\r{rows:,} rows", end="", file=sys.stderr)
+        )
+    finally:
+        db.close()
+
+    print(f"\nExported {written:,} rows to {args.output} ({file_format})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
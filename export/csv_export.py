@@ -0,0 +1,59 @@
+import csv
+import os
+import threading
+from typing import Callable, Optional
+
+
+CSV_HEADER = ['ID', 'Student Name', 'School ID', 'Fingerprint ID',
+              'Date', 'Time', 'Full Timestamp', 'Status']
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before it finishes"""
+
+
+def export_csv(db, path: str, start_date=None, end_date=None, student_filter=None,
+               progress: Optional[Callable[[int], None]] = None,
+               cancel_event: Optional[threading.Event] = None,
+               chunk_size: int = 1000) -> int:
+    """Stream attendance logs into a CSV file and return the number of rows written.
+
+    Rows are fetched and written one chunk at a time, so memory use stays flat
+    however many logs there are. ``progress(rows_written)`` is called after
+    each chunk. Setting ``cancel_event`` stops the export, removes the partial
+    file and raises ExportCancelled. The file only appears at ``path`` once
+    it is complete.
+    """
+    partial_path = f"{path}.part"
+    written = 0
+    chunks = db.iter_attendance_logs(start_date, end_date, student_filter, chunk_size=chunk_size)
+
+    try:
+        with open(partial_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_HEADER)
+
+            for logs in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+
+                # Timestamps are stored as "YYYY-MM-DD HH:MM:SS", so slice instead of parsing
+                writer.writerows(
+                    [log['id'], log['name'], log['school_id'], log['fingerprint_id'],
+                     log['timestamp'][:10], log['timestamp'][11:19], log['timestamp'], 'Present']
+                    for log in logs
+                )
+                written += len(logs)
+                if progress:
+                    progress(written)
+
+        os.replace(partial_path, path)
+        return written
+
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    finally:
+        chunks.close()
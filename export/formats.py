@@ -0,0 +1,213 @@
+"""Attendance exports for analytics tools.
+
+Unlike the spreadsheet CSV written by csv_export, these exports use one
+typed column per field, with timestamps in UTC:
+
+    id, name, school_id, fingerprint_id, timestamp, sensor_id
+
+Parquet and Arrow IPC need pyarrow. Compressed CSV always works, with zstd
+when the zstandard package is installed and gzip from the standard library
+otherwise. Rows are streamed in chunks, so memory use stays flat, and can be
+partitioned into one file per month or day.
+"""
+import csv
+import gzip
+import io
+import itertools
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from export.csv_export import ExportCancelled
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COLUMNS = ['id', 'name', 'school_id', 'fingerprint_id', 'timestamp', 'sensor_id']
+
+# Partition key length within "YYYY-MM-DD HH:MM:SS"
+PARTITIONS = {'month': 7, 'day': 10}
+
+
+class CsvWriter:
+    """Compressed CSV with ISO 8601 UTC timestamps"""
+
+    def __init__(self, path: str, compression: str):
+        if compression == "zstd":
+            self._raw = open(path, 'wb')
+            self._binary = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._raw = None
+            self._binary = gzip.open(path, 'wb')
+        self._text = io.TextIOWrapper(self._binary, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, logs: List[Dict]):
+        self._writer.writerows(
+            [log['id'], log['name'], log['school_id'], log['fingerprint_id'],
+             f"{log['timestamp'][:10]}T{log['timestamp'][11:19]}Z", log['sensor_id']]
+            for log in logs
+        )
+
+    def close(self):
+        self._text.close()
+        if self._raw is not None:
+            self._raw.close()
+
+
+class ArrowWriter:
+    """Parquet or Arrow IPC file with a typed timestamp column"""
+
+    def __init__(self, path: str, file_format: str):
+        self.schema = pyarrow.schema([
+            ('id', pyarrow.int64()),
+            ('name', pyarrow.string()),
+            ('school_id', pyarrow.string()),
+            ('fingerprint_id', pyarrow.int32()),
+            ('timestamp', pyarrow.timestamp('s', tz='UTC')),
+            ('sensor_id', pyarrow.string()),
+        ])
+        if file_format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, logs: List[Dict]):
+        # Parse the whole chunk's timestamps at once instead of row by row
+        timestamps = pyarrow.compute.strptime(
+            pyarrow.array([log['timestamp'] for log in logs], pyarrow.string()),
+            format="%Y-%m-%d %H:%M:%S", unit="s"
+        ).cast(pyarrow.timestamp('s', tz='UTC'))
+
+        table = pyarrow.Table.from_arrays([
+            pyarrow.array([log['id'] for log in logs], pyarrow.int64()),
+            pyarrow.array([log['name'] for log in logs], pyarrow.string()),
+            pyarrow.array([log['school_id'] for log in logs], pyarrow.string()),
+            pyarrow.array([log['fingerprint_id'] for log in logs], pyarrow.int32()),
+            timestamps,
+            pyarrow.array([log['sensor_id'] for log in logs], pyarrow.string()),
+        ], schema=self.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+# format name -> (file extension, writer factory, available)
+FORMATS = {
+    'parquet': (".parquet", lambda path: ArrowWriter(path, "parquet"), pyarrow is not None),
+    'arrow': (".arrow", lambda path: ArrowWriter(path, "arrow"), pyarrow is not None),
+    'csv.zst': (".csv.zst", lambda path: CsvWriter(path, "zstd"), zstandard is not None),
+    'csv.gz': (".csv.gz", lambda path: CsvWriter(path, "gzip"), True),
+}
+
+
+def available_formats() -> List[str]:
+    """Formats whose libraries are installed, best first"""
+    return [name for name, (_, _, available) in FORMATS.items() if available]
+
+
+def default_format() -> str:
+    return available_formats()[0]
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Guess the export format from a file name"""
+    for name, (extension, _, _) in FORMATS.items():
+        if path.endswith(extension):
+            return name
+    return None
+
+
+def export_logs(db, path: str, file_format: Optional[str] = None,
+                start_date=None, end_date=None, student_filter=None,
+                partition: Optional[str] = None,
+                progress: Optional[Callable[[int], None]] = None,
+                cancel_event: Optional[threading.Event] = None,
+                chunk_size: int = 10000) -> int:
+    """Export attendance logs and return the number of rows written.
+
+    Without ``partition`` everything goes into the file at ``path``. With
+    partition="month" or "day", ``path`` is a directory that receives one
+    file per period, e.g. ``path/month=2024-09/attendance.parquet``.
+    ``progress`` and ``cancel_event`` work as in csv_export.export_csv; a
+    cancelled export removes the files it created.
+    """
+    file_format = file_format or format_for_path(path) or default_format()
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+    extension, make_writer, available = FORMATS[file_format]
+    if not available:
+        raise ValueError(f"Export format {file_format} needs a library that is not installed")
+    if partition is not None and partition not in PARTITIONS:
+        raise ValueError(f"Unknown partitioning: {partition}")
+
+    created = []
+    writer = None
+    current_key = None
+    written = 0
+    chunks = db.iter_attendance_logs(start_date, end_date, student_filter, chunk_size=chunk_size)
+
+    def open_writer(key):
+        if key is None:
+            file_path = path
+        else:
+            directory = os.path.join(path, f"{partition}={key}")
+            os.makedirs(directory, exist_ok=True)
+            file_path = os.path.join(directory, f"attendance{extension}")
+        created.append(file_path)
+        return make_writer(file_path)
+
+    try:
+        for logs in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+
+            if partition is None:
+                if writer is None:
+                    writer = open_writer(None)
+                writer.write(logs)
+            else:
+                # Logs arrive newest first, so each period is one contiguous run
+                key_length = PARTITIONS[partition]
+                for key, group in itertools.groupby(logs, key=lambda log: log['timestamp'][:key_length]):
+                    if key != current_key:
+                        if writer is not None:
+                            writer.close()
+                        writer = open_writer(key)
+                        current_key = key
+                    writer.write(list(group))
+
+            written += len(logs)
+            if progress:
+                progress(written)
+
+        if writer is None and partition is None:
+            writer = open_writer(None)  # Header-only file for an empty export
+        if writer is not None:
+            writer.close()
+            writer = None
+        return written
+
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        for file_path in created:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        raise
+
+    finally:
+        chunks.close()
@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+
+class TkAsyncBridge:
+    """Runs an asyncio event loop next to the Tk main loop.
+
+    The event loop lives on its own thread. submit() schedules a coroutine
+    on it from the Tk thread without blocking; call_in_tk() hands a callable
+    back to the Tk thread from any other thread. Tk is not thread safe, so
+    callbacks go through a queue that the Tk thread drains with after().
+    """
+
+    POLL_INTERVAL = 20  # Milliseconds between checks for pending Tk callbacks
+
+    def __init__(self, root):
+        self.root = root
+        self.loop = asyncio.new_event_loop()
+        self._callbacks: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run_loop, name="TkAsyncBridge", daemon=True)
+        self._thread.start()
+        self._poll_id = self.root.after(self.POLL_INTERVAL, self._drain)
+
+    def submit(self, coro: Coroutine, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> concurrent.futures.Future:
+        """Run a coroutine on the event loop; its result is passed to on_done on the Tk thread"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(finished: concurrent.futures.Future):
+            if finished.cancelled():
+                return
+            error = finished.exception()
+            if error is not None:
+                if on_error:
+                    self.call_in_tk(on_error, error)
+                else:
+                    print(f"Background task failed: {error}")
+            elif on_done:
+                self.call_in_tk(on_done, finished.result())
+
+        future.add_done_callback(done)
+        return future
+
+    def run_sync(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine and wait for its result; only for worker threads and shutdown"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def call_in_tk(self, func: Callable, *args):
+        """Call func(*args) on the Tk thread; safe from any thread"""
+        if not self._closed:
+            self._callbacks.put((func, args))
+
+    def close(self, timeout: float = 2.0):
+        """Stop the event loop; call from the Tk thread before destroying the root"""
+        self._closed = True
+        self.root.after_cancel(self._poll_id)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _drain(self):
+        """Run queued callbacks on the Tk thread"""
+        while True:
+            try:
+                func, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error in Tk callback: {e}")
+
+        if not self._closed:
+            self._poll_id = self.root.after(self.POLL_INTERVAL, self._drain)
@@ -2,16 +2,20 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 import sv_ttk
-from PIL import Image, ImageTk
-import io
 from datetime import datetime
+from gui.photo_cache import PhotoCache
+from service.pipeline import AttendancePipeline
 
 
 class DetectionFrame(ttk.Frame):
-    def __init__(self, parent, arduino, db):
+    PROFILE_SIZE = 80  # Profile picture size in pixels
+
+    def __init__(self, parent, arduino, db, photo_cache=None):
         super().__init__(parent)
         self.arduino = arduino
         self.db = db
+        self.photo_cache = photo_cache or PhotoCache(db)
+        self.pipeline = AttendancePipeline(db)
 
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -261,10 +265,13 @@ class DetectionFrame(ttk.Frame):
 
     def _process_detection(self, fingerprint_id: int):
         """Process fingerprint detection in main thread"""
-        user = self.db.get_user_by_fingerprint(fingerprint_id)
+        result = self.pipeline.handle_scan(fingerprint_id)
+        user = result['user']
+
+        if result['status'] == AttendancePipeline.DUPLICATE:
+            return  # Finger still on the sensor; already shown and logged
 
-        if user:
-            self.db.log_attendance(user['id'])
+        if result['status'] == AttendancePipeline.GRANTED:
             self.display_user_info(user)
             self.add_to_log(user['name'], user['school_id'], "✅ Access Granted")
             self.flash_success()
@@ -281,16 +288,10 @@ class DetectionFrame(ttk.Frame):
         self.timestamp_label.configure(text=f"🕐 Detected: {datetime.now().strftime('%H:%M:%S')}")
 
         # Display profile picture if available
-        if user.get('profile_picture'):
-            try:
-                image = Image.open(io.BytesIO(user['profile_picture']))
-                image = image.resize((80, 80), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
-                self.profile_label.configure(image=photo, text="")
-                self.profile_label.image = photo  # Keep reference
-            except Exception as e:
-                print(f"Error loading profile picture: {e}")
-                self.profile_label.configure(text="👤", image="")
+        photo = self.photo_cache.get(user['id'], self.PROFILE_SIZE)
+        if photo:
+            self.profile_label.configure(image=photo, text="")
+            self.profile_label.image = photo  # Keep reference
         else:
             self.profile_label.configure(text="👤", image="")
 
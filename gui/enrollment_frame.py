@@ -1,16 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
+import os
 import threading
 
+from arduino.protocol import EnrollFail, EnrollOK, EnrollStep, SensorError
+from database.roster_import import load_roster, import_roster, write_error_report
+from gui.export_dialog import ExportDialog
+
+ENROLL_STEP_TIMEOUT = 30000  # ms to wait for the next sensor message before giving up
+
 
 class EnrollmentFrame(ttk.Frame):
-    def __init__(self, parent, arduino, db):
+    def __init__(self, parent, arduino, db, bridge=None):
         super().__init__(parent)
         self.arduino = arduino
         self.db = db
+        self.bridge = bridge  # TkAsyncBridge when arduino is an AsyncArduinoComm
         self.selected_image_path = None
         self.profile_photo = None  # Keep reference to prevent garbage collection
+        self.enrolling_existing = False  # Student already saved, e.g. by a roster import
+        self.enrollment_timer = None  # Pending step timeout while enrolling
 
         # Configure grid
         self.grid_columnconfigure((0, 1), weight=1)
@@ -85,6 +95,14 @@ class EnrollmentFrame(ttk.Frame):
         )
         self.enroll_btn.pack(fill="x", pady=20)
 
+        # Bulk import
+        self.import_btn = ttk.Button(
+            self.form_frame,
+            text="📋 Import Roster...",
+            command=self.import_roster
+        )
+        self.import_btn.pack(fill="x")
+
         # Right panel - Preview and status
         self.preview_frame = ttk.LabelFrame(self, text="Preview & Status", padding=20)
         self.preview_frame.grid(row=1, column=1, sticky="nsew", padx=(10, 20), pady=20)
@@ -206,6 +224,13 @@ class EnrollmentFrame(ttk.Frame):
             self.show_error("Fingerprint ID must be a number")
             return False
 
+        # Students from an imported roster are already saved; only their
+        # fingerprint still needs enrolling
+        existing = self.db.get_user_by_fingerprint(fid)
+        self.enrolling_existing = existing is not None and existing['school_id'] == school_id
+        if self.enrolling_existing:
+            return True
+
         # Check if IDs already exist
         if self.db.fingerprint_id_exists(fid):
             self.show_error(f"Fingerprint ID {fid} already exists")
@@ -231,49 +256,66 @@ class EnrollmentFrame(ttk.Frame):
         self.progress_bar['value'] = 0
         self.status_label.configure(text="Starting enrollment...")
 
-        # Start enrollment in separate thread
+        # Progress follows the sensor's messages as they arrive
         fingerprint_id = int(self.fingerprint_id_entry.get())
-        thread = threading.Thread(
-            target=self.enrollment_process,
-            args=(fingerprint_id,),
-            daemon=True
-        )
-        thread.start()
-
-    def enrollment_process(self, fingerprint_id):
-        """Handle enrollment process"""
+        self.update_status("Preparing enrollment...", 10)
+        self.arduino.set_enrollment_callback(self.on_enrollment_event)
+        self.arm_enrollment_timeout()
+
+        if self.bridge:
+            self.bridge.submit(
+                self.arduino.start_enrollment_mode(fingerprint_id),
+                on_error=lambda e: self.finish_enrollment(self.enrollment_failed, str(e))
+            )
+        else:
+            threading.Thread(
+                target=self.send_enrollment_command,
+                args=(fingerprint_id,),
+                daemon=True
+            ).start()
+
+    def send_enrollment_command(self, fingerprint_id):
+        """Put the sensor into enrollment mode (worker thread)"""
         try:
-            # Update status
-            self.after(0, self.update_status, "Preparing enrollment...", 10)
-
-            # Start Arduino enrollment
             self.arduino.start_enrollment_mode(fingerprint_id)
-
-            # Update status
-            self.after(0, self.update_status, "Place finger on sensor...", 30)
-
-            # Wait for enrollment completion (simplified - in real implementation,
-            # you'd want to listen for Arduino responses)
-            import time
-            time.sleep(2)
-            self.after(0, self.update_status, "Processing first scan...", 50)
-
-            time.sleep(3)
-            self.after(0, self.update_status, "Remove finger...", 70)
-
-            time.sleep(2)
-            self.after(0, self.update_status, "Place finger again...", 80)
-
-            time.sleep(3)
-            self.after(0, self.update_status, "Creating fingerprint model...", 90)
-
-            time.sleep(2)
-
-            # Simulate successful enrollment
-            self.after(0, self.enrollment_success)
-
         except Exception as e:
-            self.after(0, self.enrollment_failed, str(e))
+            self.after(0, self.finish_enrollment, self.enrollment_failed, str(e))
+
+    def on_enrollment_event(self, event):
+        """Pass an enrollment event from the serial reader to the Tk thread"""
+        if self.bridge:
+            self.bridge.call_in_tk(self.handle_enrollment_event, event)
+        else:
+            self.after(0, self.handle_enrollment_event, event)
+
+    def handle_enrollment_event(self, event):
+        """Advance the enrollment as the sensor completes each step"""
+        if self.enrollment_timer is None:
+            return  # Not enrolling, or already finished
+
+        if isinstance(event, EnrollStep):
+            self.update_status(event.message, 10 + 80 * event.step // event.total)
+            self.arm_enrollment_timeout()
+        elif isinstance(event, EnrollOK):
+            self.finish_enrollment(self.enrollment_success)
+        elif isinstance(event, (EnrollFail, SensorError)):
+            self.finish_enrollment(self.enrollment_failed, event.message)
+
+    def arm_enrollment_timeout(self):
+        """(Re)start the wait for the sensor's next message"""
+        if self.enrollment_timer is not None:
+            self.after_cancel(self.enrollment_timer)
+        self.enrollment_timer = self.after(ENROLL_STEP_TIMEOUT, self.finish_enrollment,
+                                           self.enrollment_failed, "No response from the sensor")
+
+    def finish_enrollment(self, handler, *args):
+        """Stop listening for enrollment events and report the outcome once"""
+        if self.enrollment_timer is None:
+            return
+        self.after_cancel(self.enrollment_timer)
+        self.enrollment_timer = None
+        self.arduino.set_enrollment_callback(None)
+        handler(*args)
 
     def enrollment_success(self):
         """Handle successful enrollment"""
@@ -282,7 +324,7 @@ class EnrollmentFrame(ttk.Frame):
         school_id = self.school_id_entry.get().strip()
         fingerprint_id = int(self.fingerprint_id_entry.get())
 
-        success = self.db.add_user(
+        success = self.enrolling_existing or self.db.add_user(
             fingerprint_id,
             name,
             school_id,
@@ -319,6 +361,7 @@ class EnrollmentFrame(ttk.Frame):
         self.fingerprint_id_entry.configure(state=state)
         self.picture_btn.configure(state=state)
         self.enroll_btn.configure(state=state)
+        self.import_btn.configure(state=state)
 
     def clear_form(self):
         """Clear form fields"""
@@ -332,6 +375,65 @@ class EnrollmentFrame(ttk.Frame):
         self.progress_bar['value'] = 0
         self.status_label.configure(text="Ready for enrollment")
 
+    def import_roster(self):
+        """Add the students of a roster CSV, with photos from a folder"""
+        csv_path = filedialog.askopenfilename(
+            title="Select Roster CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not csv_path:
+            return
+        photo_dir = filedialog.askdirectory(title="Select Photo Folder (Cancel for none)") or None
+
+        try:
+            students, errors = load_roster(self.db, csv_path, photo_dir)
+        except (OSError, ValueError) as e:
+            self.show_error(f"Could not read roster: {e}")
+            return
+
+        if not students:
+            self.show_import_report(csv_path, 0, errors)
+            return
+        if not messagebox.askyesno(
+                "Import Roster",
+                f"Import {len(students):,} students?"
+                + (f"\n{len(errors):,} rows have errors and will be skipped." if errors else "")):
+            return
+
+        ExportDialog(
+            self, "Importing Roster", len(students),
+            lambda progress, cancel_event: import_roster(self.db, students, progress, cancel_event),
+            csv_path, action="Import", noun="students",
+            on_done=lambda result: self.roster_imported(csv_path, result, errors)
+        )
+
+    def roster_imported(self, csv_path, result, errors):
+        """Show the outcome of a finished roster import"""
+        if result['cancelled']:
+            messagebox.showinfo("Import Cancelled", "The import was cancelled; no students were added.")
+            return
+        self.refresh_users_list()
+        errors = sorted(errors + result['errors'], key=lambda error: error['row'])
+        self.show_import_report(csv_path, result['imported'], errors)
+
+    def show_import_report(self, csv_path, imported, errors):
+        """Summarize an import, saving the rows that failed next to the roster"""
+        message = f"Imported {imported:,} students."
+        if errors:
+            report_path = os.path.splitext(csv_path)[0] + "_errors.csv"
+            try:
+                write_error_report(report_path, errors)
+                message += f"\n\n{len(errors):,} rows were skipped; see {report_path}"
+            except OSError as e:
+                message += f"\n\n{len(errors):,} rows were skipped (could not save report: {e})"
+            shown = errors[:10]
+            message += "\n\n" + "\n".join(f"Row {error['row']}: {error['error']}" for error in shown)
+            if len(errors) > len(shown):
+                message += "\n..."
+            messagebox.showwarning("Roster Import", message)
+        else:
+            messagebox.showinfo("Roster Import", message)
+
     def refresh_users_list(self):
         """Refresh the enrolled users list"""
         users = self.db.get_all_users()
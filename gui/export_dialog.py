@@ -0,0 +1,96 @@
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable, Optional
+
+from export.csv_export import ExportCancelled
+
+
+class ExportDialog(tk.Toplevel):
+    """Runs an export on a worker thread and shows its progress.
+
+    ``export`` is called on the worker as ``export(progress, cancel_event)``
+    and returns the number of rows written. The worker only stores its
+    progress; the dialog polls it with after(), so Tk is only touched from
+    the main thread. Other long jobs, like roster imports, can use it with
+    their own ``action`` and ``noun`` and an ``on_done(result)`` callback
+    that replaces the success message.
+    """
+
+    POLL_INTERVAL = 100  # Milliseconds between progress updates
+
+    def __init__(self, parent, title: str, total: int, export: Callable, filename: str,
+                 action: str = "Export", noun: str = "records", on_done: Optional[Callable] = None):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("420x150")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+
+        self.total = total
+        self.filename = filename
+        self.action = action
+        self.noun = noun
+        self.on_done = on_done
+        self.cancel_event = threading.Event()
+
+        # Written by the worker thread, read by _poll
+        self._written = 0
+        self._result = None
+        self._error = None
+        self._done = False
+
+        self.status_label = ttk.Label(self, text=f"{action}ing {total:,} {noun}...", font=("Arial", 10))
+        self.status_label.pack(padx=20, pady=(20, 10), anchor="w")
+
+        self.progress_bar = ttk.Progressbar(self, mode="determinate", maximum=max(total, 1), length=380)
+        self.progress_bar.pack(padx=20, pady=5)
+
+        self.cancel_btn = ttk.Button(self, text="Cancel", command=self.cancel)
+        self.cancel_btn.pack(pady=(10, 20))
+
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self._worker = threading.Thread(target=self._run, args=(export,), daemon=True)
+        self._worker.start()
+        self.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        """Ask the worker to stop; the dialog closes once it has"""
+        self.cancel_event.set()
+        self.cancel_btn.state(['disabled'])
+        self.status_label.configure(text="Cancelling...")
+
+    def _run(self, export):
+        try:
+            self._result = export(self._on_progress, self.cancel_event)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+
+    def _on_progress(self, written: int):
+        self._written = written
+
+    def _poll(self):
+        """Update the progress bar from the worker's counters"""
+        if not self._done:
+            self.progress_bar['value'] = self._written
+            if not self.cancel_event.is_set():
+                self.status_label.configure(
+                    text=f"{self.action}ed {self._written:,} of {self.total:,} {self.noun}")
+            self.after(self.POLL_INTERVAL, self._poll)
+            return
+
+        self.grab_release()
+        self.destroy()
+
+        if isinstance(self._error, ExportCancelled):
+            messagebox.showinfo(f"{self.action} Cancelled", f"The {self.action.lower()} was cancelled.")
+        elif self._error is not None:
+            messagebox.showerror("Error", f"Error {self.action.lower()}ing {self.noun}: {self._error}")
+        elif self.on_done is not None:
+            self.on_done(self._result)
+        else:
+            messagebox.showinfo("Success", f"{self._result:,} records exported to {self.filename}")
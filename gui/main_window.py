@@ -3,17 +3,22 @@ from tkinter import ttk, messagebox
 from gui.enrollment_frame import EnrollmentFrame
 from gui.detection_frame import DetectionFrame
 from gui.records_frame import RecordsFrame
-from arduino.arduino_comm import ArduinoComm
+from gui.photo_cache import PhotoCache
+from gui.async_bridge import TkAsyncBridge
+from arduino.async_comm import AsyncArduinoComm
 from database.db_manager import DatabaseManager
+from service.event_bus import EventBus, ATTENDANCE_LOGGED
 
 
 class MainWindow:
     def __init__(self, root):
         self.root = root
 
-        # Initialize components
-        self.arduino = ArduinoComm()
+        # Initialize components; serial I/O runs on the bridge's event loop
+        self.bridge = TkAsyncBridge(root)
+        self.arduino = AsyncArduinoComm()
         self.db = DatabaseManager()
+        self.events = EventBus()
 
         # Configure window
         self.root.title("Fingerprint Attendance System")
@@ -26,6 +31,7 @@ class MainWindow:
 
         self.setup_ui()
         self.setup_arduino()
+        self.setup_events()
 
         # Setup window closing protocol
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -124,10 +130,11 @@ class MainWindow:
         self.main_frame.grid_columnconfigure(0, weight=1)
         self.main_frame.grid_rowconfigure(0, weight=1)
 
-        # Initialize frames
-        self.detection_frame = DetectionFrame(self.main_frame, self.arduino, self.db)
-        self.enrollment_frame = EnrollmentFrame(self.main_frame, self.arduino, self.db)
-        self.records_frame = RecordsFrame(self.main_frame, self.db)
+        # Initialize frames, sharing one cache of profile pictures
+        self.photo_cache = PhotoCache(self.db)
+        self.detection_frame = DetectionFrame(self.main_frame, self.arduino, self.db, self.photo_cache)
+        self.enrollment_frame = EnrollmentFrame(self.main_frame, self.arduino, self.db, self.bridge)
+        self.records_frame = RecordsFrame(self.main_frame, self.db, self.photo_cache)
 
         # Show detection frame by default
         self.show_detection()
@@ -137,38 +144,59 @@ class MainWindow:
         """Setup Arduino communication"""
         self.arduino.set_detection_callback(self.on_fingerprint_detected)
 
+    def setup_events(self):
+        """Publish committed attendance logs and update the UI from them"""
+        self.db.add_commit_listener(lambda logs: self.events.publish(ATTENDANCE_LOGGED, logs))
+        self.events.subscribe(ATTENDANCE_LOGGED, lambda logs: self.update_stats(),
+                              dispatch=self.bridge.call_in_tk)
+        self.events.subscribe(ATTENDANCE_LOGGED, self.records_frame.on_attendance_logged,
+                              dispatch=self.bridge.call_in_tk)
+
     def toggle_arduino_connection(self):
-        """Toggle Arduino connection"""
+        """Toggle Arduino connection without blocking the UI"""
+        self.connect_btn.state(['disabled'])
         if not self.arduino.is_connected:
-            if self.arduino.connect():
-                self.connection_status.configure(text="🟢 Connected")
-                self.connect_btn.configure(text="🔌 Disconnect")
-            else:
-                self.show_error("Failed to connect to Arduino")
+            self.connection_status.configure(text="🟡 Connecting...")
+            self.bridge.submit(self.arduino.connect(), on_done=self.on_connect_finished)
+        else:
+            self.bridge.submit(self.arduino.disconnect(), on_done=lambda _: self.on_disconnected())
+
+    def on_connect_finished(self, connected: bool):
+        """Update the sidebar once a connection attempt finishes"""
+        self.connect_btn.state(['!disabled'])
+        if connected:
+            self.connection_status.configure(text="🟢 Connected")
+            self.connect_btn.configure(text="🔌 Disconnect")
         else:
-            self.arduino.disconnect()
             self.connection_status.configure(text="⚫ Disconnected")
-            self.connect_btn.configure(text="🔌 Connect Arduino")
+            self.show_error("Failed to connect to Arduino")
+
+    def on_disconnected(self):
+        self.connect_btn.state(['!disabled'])
+        self.connection_status.configure(text="⚫ Disconnected")
+        self.connect_btn.configure(text="🔌 Connect Arduino")
 
     def update_stats(self):
-        """Update sidebar statistics"""
-        total_users = len(self.db.get_all_users()) if hasattr(self.db, 'get_all_users') else 0
-        # You can implement today's attendance count similarly
-        today_count = 0  # Implement this based on your database structure
+        """Update sidebar statistics from maintained counters"""
+        total_users = self.db.get_user_count()
+        today_count = self.db.get_daily_summary()['unique_users']
 
         self.total_users_label.configure(text=f"👥 Total Users: {total_users}")
         self.today_attendance_label.configure(text=f"📅 Today's Attendance: {today_count}")
 
     def on_fingerprint_detected(self, fingerprint_id: int):
-        """Handle fingerprint detection"""
+        """Handle fingerprint detection on the event loop thread"""
+        self.bridge.call_in_tk(self._handle_detection, fingerprint_id)
+
+    def _handle_detection(self, fingerprint_id: int):
         self.detection_frame.on_fingerprint_detected(fingerprint_id)
-        self.update_stats()
 
     def show_detection(self):
         """Show detection frame"""
         self.hide_all_frames()
         self.detection_frame.grid(row=0, column=0, sticky="nsew", padx=20, pady=20)
         self.update_button_states("detection")
+        self.update_stats()
 
     def show_enrollment(self):
         """Show enrollment frame"""
@@ -176,6 +204,7 @@ class MainWindow:
         self.enrollment_frame.grid(row=0, column=0, sticky="nsew", padx=20, pady=20)
         self.enrollment_frame.refresh_ui()
         self.update_button_states("enrollment")
+        self.update_stats()
 
     def show_records(self):
         """Show records frame"""
@@ -212,5 +241,10 @@ class MainWindow:
 
     def on_closing(self):
         """Handle window closing"""
-        self.arduino.disconnect()
+        try:
+            self.bridge.run_sync(self.arduino.disconnect(), timeout=2)
+        except Exception as e:
+            print(f"Error disconnecting Arduino: {e}")
+        self.bridge.close()
+        self.db.close()
         self.root.destroy()
\ No newline at end of file
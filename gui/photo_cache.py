@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from PIL import Image, ImageTk
+import io
+
+
+class PhotoCache:
+    """LRU cache of ready-to-display profile PhotoImages.
+
+    Entries are keyed by (user_id, size) and built from the stored thumbnails,
+    so a repeat display is a dictionary hit instead of an image decode. Users
+    without a picture are cached as None so they do not hit the database again.
+    Must only be used from the Tk main thread.
+    """
+
+    def __init__(self, db, max_size: int = 256):
+        self.db = db
+        self.max_size = max_size
+        self._photos = OrderedDict()
+
+    def get(self, user_id: int, size: int):
+        """Get the PhotoImage for a user at the given size, or None"""
+        key = (user_id, size)
+        if key in self._photos:
+            self._photos.move_to_end(key)
+            return self._photos[key]
+
+        photo = None
+        thumbnail = self.db.get_thumbnail(user_id, size)
+        if thumbnail:
+            try:
+                photo = ImageTk.PhotoImage(Image.open(io.BytesIO(thumbnail)))
+            except Exception as e:
+                print(f"Error loading profile picture: {e}")
+
+        self._photos[key] = photo
+        if len(self._photos) > self.max_size:
+            self._photos.popitem(last=False)
+        return photo
+
+    def invalidate(self, user_id=None):
+        """Drop cached photos for one user, or for everyone"""
+        if user_id is None:
+            self._photos.clear()
+            return
+
+        for key in [key for key in self._photos if key[0] == user_id]:
+            del self._photos[key]
@@ -1,15 +1,180 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import csv
-from PIL import Image, ImageTk
-import io
+import threading
+from gui.virtual_treeview import VirtualTreeview
+from gui.photo_cache import PhotoCache
+from gui.export_dialog import ExportDialog
+from export.csv_export import export_csv
+from export.formats import FORMATS, available_formats, export_logs, format_for_path
+from database.timestamps import local_day_bounds, local_today, to_local, to_utc_timestamp
+
+
+class AttendanceRowSource:
+    """Row source that pages attendance logs in from the database on demand.
+
+    Logs committed after the first page was read are not paged in; they are
+    pushed in with prepend() and kept in a short list ahead of the pages.
+
+    Pages whose keyset cursor is known (the next page while scrolling) are
+    read right away. Pages further off, reached by dragging the scrollbar,
+    show placeholder rows while a worker thread seeks their cursor from the
+    nearer end of the list and reads them; on_loaded() is then called from
+    that thread. Only the pages of the latest request are loaded.
+    """
+
+    PLACEHOLDER = ("", "Loading...", "", "", "", "")
+
+    def __init__(self, db, query, total: int, page_size: int = 200, max_pages: int = 20,
+                 on_loaded=None):
+        self.db = db
+        self.query = query
+        self.total = total
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_loaded = on_loaded
+
+        self._pages = OrderedDict()  # page number -> formatted rows, LRU order
+        self._cursors = {0: None}  # page number -> keyset cursor for its first row
+        self._head = []  # Rows added by prepend(), newest first
+        self._anchor_id = None  # Newest log ID the pages can contain
+        self._lock = threading.Lock()  # Guards _pages and _cursors against the worker
+        self._requested = []  # Pages the worker should load, latest request only
+        self._worker_running = False
+
+    def __len__(self):
+        return self.total
+
+    @staticmethod
+    def format_row(log) -> tuple:
+        # Shown in local time, like the date filters and the daily counts
+        local = to_local(log['timestamp'])
+        return (log['id'], log['name'], log['school_id'], local[:10], local[11:19], "Present")
+
+    def prepend(self, logs) -> int:
+        """Add newly logged rows at the top; returns how many were new"""
+        if self._anchor_id is None:
+            self._get_page(0)  # Pin the pages first so no row shows up twice
+
+        rows = [self.format_row(log)
+                for log in sorted(logs, key=lambda log: log['id'], reverse=True)
+                if log['id'] > self._anchor_id]
+        self._head[:0] = rows
+        self.total += len(rows)
+        return len(rows)
+
+    def get_rows(self, start: int, count: int) -> list:
+        if self._anchor_id is None:
+            self._get_page(0)
+
+        rows = self._head[start:start + count]
+        index = max(0, start - len(self._head))
+        end = min(start + count, self.total) - len(self._head)
+        missing = []
+        while index < end:
+            page_no, offset = divmod(index, self.page_size)
+            page = self._get_page(page_no)
+            if page is None:
+                # Not loaded yet; hold its place until the worker reads it
+                missing.append(page_no)
+                chunk = [self.PLACEHOLDER] * min(self.page_size - offset, end - index)
+            else:
+                chunk = page[offset:offset + end - index]
+                if not chunk:
+                    break
+            rows.extend(chunk)
+            index += len(chunk)
+
+        if missing:
+            self._request(missing)
+        return rows
+
+    def _get_page(self, page_no: int):
+        """Rows of a page, or None when it is being loaded in the background"""
+        with self._lock:
+            if page_no in self._pages:
+                self._pages.move_to_end(page_no)
+                return self._pages[page_no]
+            cursor_known = page_no in self._cursors
+
+        if cursor_known or self.on_loaded is None:
+            return self._load_page(page_no)
+        return None
+
+    def _request(self, pages: list):
+        """Have the worker load ``pages``, replacing any older request"""
+        with self._lock:
+            self._requested = list(pages)
+            if self._worker_running:
+                return
+            self._worker_running = True
+        threading.Thread(target=self._load_requested, daemon=True).start()
+
+    def _load_requested(self):
+        """Worker thread: load requested pages until none are left"""
+        while True:
+            with self._lock:
+                if not self._requested:
+                    self._worker_running = False
+                    return
+                page_no = self._requested.pop(0)
+                if page_no in self._pages:
+                    continue
+            self._load_page(page_no)
+            self.on_loaded()
+
+    def _seek_cursor(self, page_no: int):
+        """Keyset cursor of a page, counted from the nearest known cursor or from the oldest log"""
+        with self._lock:
+            known = max(p for p in self._cursors if p <= page_no)
+            cursor, newest = self._cursors[known], self._cursors[0]
+
+        rows_after = (page_no - known) * self.page_size - 1
+        rows_before = self.total - len(self._head) - page_no * self.page_size
+        if 0 <= rows_before < rows_after:
+            return self.db.seek_attendance_cursor(*self.query, cursor=newest, skip=rows_before,
+                                                  oldest_first=True)
+        return self.db.seek_attendance_cursor(*self.query, cursor=cursor, skip=rows_after)
+
+    def _load_page(self, page_no: int) -> list:
+        with self._lock:
+            cursor_known = page_no in self._cursors
+            cursor = self._cursors.get(page_no)
+        if not cursor_known:
+            cursor = self._seek_cursor(page_no)
+
+        if cursor_known or cursor:
+            logs, next_cursor = self.db.get_attendance_page(*self.query, cursor=cursor, limit=self.page_size)
+        else:
+            logs, next_cursor = [], None  # Past the last log
+
+        if self._anchor_id is None and page_no == 0:
+            # Later reads of page 0 stop at today's newest row; newer ones come via prepend()
+            self._anchor_id = logs[0]['id'] if logs else 0
+            cursor = (logs[0]['timestamp'], logs[0]['id'] + 1) if logs else ("", 0)
+
+        rows = [self.format_row(log) for log in logs]
+
+        with self._lock:
+            self._cursors[page_no] = cursor
+            if next_cursor:
+                self._cursors[page_no + 1] = next_cursor
+            self._pages[page_no] = rows
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return rows
 
 
 class RecordsFrame(ttk.Frame):
-    def __init__(self, parent, db):
+    PAGE_SIZE = 200  # Rows fetched per database page
+    PROFILE_SIZE = 100  # Profile picture size in the details dialog
+
+    def __init__(self, parent, db, photo_cache=None):
         super().__init__(parent)
         self.db = db
+        self.photo_cache = photo_cache or PhotoCache(db)
 
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -79,7 +244,7 @@ class RecordsFrame(ttk.Frame):
         # Export button
         self.export_btn = ttk.Button(
             self.control_frame,
-            text="📥 Export CSV",
+            text="📥 Export",
             command=self.export_to_csv
         )
         self.export_btn.grid(row=1, column=4, padx=5, pady=5, sticky="ew")
@@ -124,20 +289,11 @@ class RecordsFrame(ttk.Frame):
         )
         self.last_update_label.grid(row=0, column=3, padx=10, pady=5)
 
-        # Treeview for records
-        self.tree_frame = ttk.Frame(self.records_frame)
-        self.tree_frame.grid(row=1, column=0, sticky="nsew")
-        self.tree_frame.grid_columnconfigure(0, weight=1)
-        self.tree_frame.grid_rowconfigure(0, weight=1)
-
-        # Define columns
+        # Virtualized treeview for records
         columns = ("ID", "Name", "School ID", "Date", "Time", "Status")
-        self.tree = ttk.Treeview(
-            self.tree_frame,
-            columns=columns,
-            show="headings",
-            height=15
-        )
+        self.records_view = VirtualTreeview(self.records_frame, columns, height=15)
+        self.records_view.grid(row=1, column=0, sticky="nsew")
+        self.tree = self.records_view.tree
 
         # Configure columns
         self.tree.heading("ID", text="ID")
@@ -155,16 +311,6 @@ class RecordsFrame(ttk.Frame):
         self.tree.column("Time", width=100, anchor="center")
         self.tree.column("Status", width=100, anchor="center")
 
-        # Scrollbars
-        self.v_scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        self.h_scrollbar = ttk.Scrollbar(self.tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=self.v_scrollbar.set, xscrollcommand=self.h_scrollbar.set)
-
-        # Grid treeview and scrollbars
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
-        self.h_scrollbar.grid(row=1, column=0, sticky="ew")
-
         # Bind double-click event
         self.tree.bind("<Double-1>", self.on_record_double_click)
 
@@ -194,32 +340,7 @@ class RecordsFrame(ttk.Frame):
     def refresh_logs(self):
         """Refresh attendance logs"""
         try:
-            # Clear existing data
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            # Get logs from database
-            logs = self.db.get_attendance_logs()
-
-            if logs:
-                for log in logs:
-                    # Format datetime
-                    timestamp = datetime.fromisoformat(log['timestamp'])
-                    date_str = timestamp.strftime("%Y-%m-%d")
-                    time_str = timestamp.strftime("%H:%M:%S")
-
-                    # Insert into treeview
-                    self.tree.insert("", "end", values=(
-                        log['id'],
-                        log['name'],
-                        log['school_id'],
-                        date_str,
-                        time_str,
-                        "Present"
-                    ))
-
-            # Update summary
-            self.update_summary(logs)
+            self.load_records()
             self.last_update_label.configure(
                 text=f"Last Updated: {datetime.now().strftime('%H:%M:%S')}"
             )
@@ -227,25 +348,65 @@ class RecordsFrame(ttk.Frame):
         except Exception as e:
             self.show_error(f"Error loading records: {e}")
 
-    def update_summary(self, logs):
-        """Update summary statistics"""
-        if not logs:
-            self.total_label.configure(text="Total Records: 0")
-            self.unique_students_label.configure(text="Unique Students: 0")
-            self.today_label.configure(text="Today's Records: 0")
+    def load_records(self, start_date=None, end_date=None, student_filter=None):
+        """Point the table at a new query and show its first rows"""
+        summary = self.db.get_attendance_summary(start_date, end_date, student_filter)
+        source = AttendanceRowSource(
+            self.db,
+            (start_date, end_date, student_filter),
+            summary['total'],
+            page_size=self.PAGE_SIZE
+        )
+        source.on_loaded = lambda: self.after(0, self.on_page_loaded, source)
+        self.records_view.set_source(source)
+
+        # Update summary
+        self.summary = summary
+        self.update_summary(summary)
+
+    def on_page_loaded(self, source):
+        """Replace placeholder rows once a page has been read in the background"""
+        if self.records_view.source is source:
+            self.records_view.refresh()
+
+    def on_attendance_logged(self, logs):
+        """Show newly committed logs that match the current filters (Tk thread)"""
+        source = self.records_view.source
+        if not isinstance(source, AttendanceRowSource):
+            return
+
+        start_date, end_date, student_filter = source.query
+        start = to_utc_timestamp(start_date) if start_date else None
+        end = to_utc_timestamp(end_date) if end_date else None
+
+        matching = [
+            log for log in logs
+            if (start is None or log['timestamp'] >= start)
+            and (end is None or log['timestamp'] <= end)
+            and (not student_filter
+                 or student_filter in (log['name'] or "").lower()
+                 or student_filter in (log['school_id'] or "").lower())
+        ]
+        if not matching:
             return
 
-        total_records = len(logs)
-        unique_students = len(set(log['school_id'] for log in logs))
+        added = source.prepend(matching)
+        if not added:
+            return
+        self.records_view.rows_inserted(added)
 
-        # Count today's records
-        today = datetime.now().date()
-        today_records = sum(1 for log in logs
-                            if datetime.fromisoformat(log['timestamp']).date() == today)
+        # Unique students is left as is until the next full load
+        today_start, tomorrow_start = local_day_bounds(local_today())
+        self.summary['total'] += added
+        self.summary['today'] += sum(
+            1 for log in matching if today_start <= log['timestamp'] < tomorrow_start)
+        self.update_summary(self.summary)
 
-        self.total_label.configure(text=f"Total Records: {total_records}")
-        self.unique_students_label.configure(text=f"Unique Students: {unique_students}")
-        self.today_label.configure(text=f"Today's Records: {today_records}")
+    def update_summary(self, summary):
+        """Update summary statistics"""
+        self.total_label.configure(text=f"Total Records: {summary['total']}")
+        self.unique_students_label.configure(text=f"Unique Students: {summary['unique_students']}")
+        self.today_label.configure(text=f"Today's Records: {summary['today']}")
 
     def on_date_filter_changed(self, event=None):
         """Handle date filter change"""
@@ -256,7 +417,7 @@ class RecordsFrame(ttk.Frame):
         # Apply filter after a short delay to avoid excessive filtering
         if hasattr(self, '_filter_timer'):
             self.after_cancel(self._filter_timer)
-        self._filter_timer = self.after(500, self.apply_filters)
+        self._filter_timer = self.after(250, self.apply_filters)
 
     def apply_filters(self):
         """Apply current filters to the records"""
@@ -265,44 +426,27 @@ class RecordsFrame(ttk.Frame):
             date_filter = self.date_var.get()
             student_filter = self.student_var.get().strip().lower()
 
-            # Calculate date range
-            end_date = datetime.now()
+            # Calculate date range; open-ended ranges keep showing new scans
+            end_date = None
+            now = datetime.now()
             if date_filter == "today":
-                start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+                start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
             elif date_filter == "yesterday":
-                start_date = (end_date - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+                start_date = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
                 end_date = start_date + timedelta(days=1)
             elif date_filter == "last_week":
-                start_date = end_date - timedelta(days=7)
+                start_date = now - timedelta(days=7)
             elif date_filter == "last_month":
-                start_date = end_date - timedelta(days=30)
+                start_date = now - timedelta(days=30)
             else:  # all
                 start_date = None
 
-            # Get filtered logs
-            logs = self.db.get_attendance_logs(start_date, end_date, student_filter)
-
-            # Clear and populate treeview
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            if logs:
-                for log in logs:
-                    timestamp = datetime.fromisoformat(log['timestamp'])
-                    date_str = timestamp.strftime("%Y-%m-%d")
-                    time_str = timestamp.strftime("%H:%M:%S")
+            # The range is in local time; aware datetimes are converted to UTC by the queries
+            start_date = start_date.astimezone() if start_date else None
+            end_date = end_date.astimezone() if end_date else None
 
-                    self.tree.insert("", "end", values=(
-                        log['id'],
-                        log['name'],
-                        log['school_id'],
-                        date_str,
-                        time_str,
-                        "Present"
-                    ))
-
-            # Update summary
-            self.update_summary(logs)
+            # Load the first page of filtered logs
+            self.load_records(start_date, end_date, student_filter)
 
         except Exception as e:
             self.show_error(f"Error applying filters: {e}")
@@ -320,7 +464,7 @@ class RecordsFrame(ttk.Frame):
         item = self.tree.item(selection[0])
         values = item['values']
 
-        if not values:
+        if not values or values[0] == "":  # Nothing selected, or a row still loading
             return
 
         # Get full record details
@@ -361,17 +505,11 @@ class RecordsFrame(ttk.Frame):
         title_label.pack(pady=(0, 20))
 
         # Profile picture (if available)
-        if record.get('profile_picture'):
-            try:
-                image = Image.open(io.BytesIO(record['profile_picture']))
-                image = image.resize((100, 100), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
-
-                profile_label = ttk.Label(main_frame, image=photo)
-                profile_label.image = photo  # Keep reference
-                profile_label.pack(pady=10)
-            except Exception:
-                pass
+        photo = self.photo_cache.get(record['user_id'], self.PROFILE_SIZE)
+        if photo:
+            profile_label = ttk.Label(main_frame, image=photo)
+            profile_label.image = photo  # Keep reference
+            profile_label.pack(pady=10)
 
         # Record details
         details = [
@@ -379,8 +517,8 @@ class RecordsFrame(ttk.Frame):
             ("Student Name:", record['name']),
             ("School ID:", record['school_id']),
             ("Fingerprint ID:", record['fingerprint_id']),
-            ("Date:", datetime.fromisoformat(record['timestamp']).strftime("%Y-%m-%d")),
-            ("Time:", datetime.fromisoformat(record['timestamp']).strftime("%H:%M:%S")),
+            ("Date:", to_local(record['timestamp'])[:10]),
+            ("Time:", to_local(record['timestamp'])[11:19]),
             ("Status:", "Present")
         ]
 
@@ -407,7 +545,11 @@ class RecordsFrame(ttk.Frame):
         item = self.tree.item(selection[0])
         values = item['values']
 
-        if not values:
+        if not values or values[0] == "":  # Nothing selected, or a row still loading
+            return
+
+        if self.db.is_archived_record(values[0]):
+            self.show_error("Archived records are read-only and cannot be deleted")
             return
 
         # Confirm deletion
@@ -419,7 +561,6 @@ class RecordsFrame(ttk.Frame):
             try:
                 record_id = values[0]
                 if self.db.delete_attendance_record(record_id):
-                    self.tree.delete(selection[0])
                     messagebox.showinfo("Success", "Record deleted successfully!")
                     self.refresh_logs()
                 else:
@@ -428,48 +569,35 @@ class RecordsFrame(ttk.Frame):
                 self.show_error(f"Error deleting record: {e}")
 
     def export_to_csv(self):
-        """Export all records to CSV"""
+        """Export all records to CSV, or to an analytics format chosen by file type"""
         try:
-            # Get filename from user
+            # Get filename from user; analytics formats are offered if their library is installed
+            filetypes = [("CSV files", "*.csv")]
+            filetypes += [(f"{name} (analytics)", f"*{FORMATS[name][0]}") for name in available_formats()]
             filename = filedialog.asksaveasfilename(
                 title="Export Attendance Records",
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+                filetypes=filetypes + [("All files", "*.*")]
             )
 
             if not filename:
                 return
 
-            # Get all records
-            logs = self.db.get_attendance_logs()
-
-            if not logs:
+            total = self.db.get_attendance_summary()['total']
+            if not total:
                 messagebox.showwarning("No Data", "No records to export!")
                 return
 
-            # Write to CSV
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
+            # Stream every record to disk on a worker thread
+            file_format = format_for_path(filename)
+            if file_format:
+                export = lambda progress, cancel_event: export_logs(
+                    self.db, filename, file_format, progress=progress, cancel_event=cancel_event)
+            else:
+                export = lambda progress, cancel_event: export_csv(
+                    self.db, filename, progress=progress, cancel_event=cancel_event)
 
-                # Write header
-                writer.writerow(['ID', 'Student Name', 'School ID', 'Fingerprint ID',
-                                 'Date', 'Time', 'Full Timestamp', 'Status'])
-
-                # Write data
-                for log in logs:
-                    timestamp = datetime.fromisoformat(log['timestamp'])
-                    writer.writerow([
-                        log['id'],
-                        log['name'],
-                        log['school_id'],
-                        log['fingerprint_id'],
-                        timestamp.strftime("%Y-%m-%d"),
-                        timestamp.strftime("%H:%M:%S"),
-                        log['timestamp'],
-                        'Present'
-                    ])
-
-            messagebox.showinfo("Success", f"Records exported to {filename}")
+            ExportDialog(self, "Export Attendance Records", total, export, filename)
 
         except Exception as e:
             self.show_error(f"Error exporting records: {e}")
@@ -503,7 +631,8 @@ class RecordsFrame(ttk.Frame):
                 for item_id in selection:
                     item = self.tree.item(item_id)
                     values = item['values']
-                    writer.writerow(values)
+                    if values and values[0] != "":  # Skip rows still loading
+                        writer.writerow(values)
 
             messagebox.showinfo("Success", f"Selected records exported to {filename}")
 
@@ -0,0 +1,179 @@
+from tkinter import ttk
+
+
+class ListRowSource:
+    """Row source backed by an in-memory list of value tuples"""
+
+    def __init__(self, rows=None):
+        self.rows = list(rows or [])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get_rows(self, start: int, count: int) -> list:
+        return self.rows[start:start + count]
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview that only materializes the rows around the visible window.
+
+    Rows are pulled on demand from a row source providing ``__len__`` and
+    ``get_rows(start, count)``. The widget keeps the visible rows plus
+    ``overscan`` rows above and below as Treeview items and rewrites their
+    values in place as the user scrolls, so the cost of scrolling and
+    filtering does not depend on the total row count.
+    """
+
+    def __init__(self, parent, columns, height: int = 15, overscan: int = 10, key_column: int = 0):
+        super().__init__(parent)
+        self.overscan = overscan
+        self.key_column = key_column
+        self.source = ListRowSource()
+
+        self._start = 0  # Source index of the first materialized row
+        self._top = 0  # Source index of the first visible row
+        self._visible = height  # Rows that fit in the viewport
+        self._items = []  # Materialized item IDs, reused across renders
+        self._item_keys = {}
+        self._selected_keys = set()
+        self._last_selection = ()
+        self._rewindow_pending = False
+        self._scroll_target = None  # Latest scrollbar position waiting to be rendered
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height)
+        self.v_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.h_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=self.on_tree_yview, xscrollcommand=self.h_scrollbar.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.h_scrollbar.grid(row=1, column=0, sticky="ew")
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select, add="+")
+
+    def set_source(self, source):
+        """Replace the row source and jump back to the first row"""
+        self.source = source
+        self._selected_keys = set()
+        self.render(0)
+
+    def refresh(self):
+        """Re-read the materialized rows from the current source"""
+        self.render(self._top)
+
+    def rows_inserted(self, count: int):
+        """Account for ``count`` rows added at the top of the source"""
+        if self._top == 0:
+            self.render(0)  # Following the newest rows, so show the new ones
+        else:
+            # Keep the rows the user is reading in view; they moved down
+            self._start += count
+            self._top += count
+            self.update_scrollbar()
+
+    def render(self, top: int):
+        """Materialize the window of rows around source index ``top``"""
+        self._rewindow_pending = False
+        total = len(self.source)
+        top = max(0, min(top, total - self._visible))
+        start = max(0, top - self.overscan)
+        rows = self.source.get_rows(start, self._visible + 2 * self.overscan)
+
+        # Grow or shrink the pool of items, then rewrite their values in place
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert("", "end"))
+        if len(self._items) > len(rows):
+            self.tree.delete(*self._items[len(rows):])
+            del self._items[len(rows):]
+
+        self._item_keys = {}
+        selected = []
+        for iid, values in zip(self._items, rows):
+            self.tree.item(iid, values=values)
+            key = values[self.key_column]
+            self._item_keys[iid] = key
+            if key in self._selected_keys:
+                selected.append(iid)
+
+        # Keep the selection attached to rows rather than to reused items
+        self._last_selection = tuple(selected)
+        self.tree.selection_set(selected)
+
+        self._start = start
+        self._top = top
+        if rows:
+            self.tree.yview_moveto((top - start) / len(rows))
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        """Map the materialized window onto the full row count"""
+        total = len(self.source)
+        if total == 0:
+            self.v_scrollbar.set(0, 1)
+        else:
+            self.v_scrollbar.set(self._top / total, min(1.0, (self._top + self._visible) / total))
+
+    def on_scrollbar(self, *args):
+        """Handle scrollbar drags and clicks in source row coordinates.
+
+        A thumb drag sends a stream of moveto events; the thumb follows each
+        one, but only the latest position is rendered once Tk is idle.
+        """
+        total = len(self.source)
+        current = self._top if self._scroll_target is None else self._scroll_target
+        if args[0] == "moveto":
+            top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            top = current + (amount * self._visible if args[2] == "pages" else amount)
+        else:
+            return
+
+        top = max(0, min(top, total - self._visible))
+        if total:
+            self.v_scrollbar.set(top / total, min(1.0, (top + self._visible) / total))
+        if self._scroll_target is None:
+            self.after_idle(self._render_scroll_target)
+        self._scroll_target = top
+
+    def _render_scroll_target(self):
+        top, self._scroll_target = self._scroll_target, None
+        if top is not None:
+            self.render(top)
+
+    def on_tree_yview(self, first, last):
+        """Track native scrolling and re-window near the materialized edges"""
+        first, last = float(first), float(last)
+        count = len(self._items)
+        total = len(self.source)
+
+        internal_top = round(first * count)
+        if count and last - first < 1.0:
+            self._visible = max(1, round((last - first) * count))
+        elif self._start + count < total:
+            # The viewport is taller than the window, so materialize more rows
+            self._visible = count + self.overscan
+
+        self._top = self._start + internal_top
+        self.update_scrollbar()
+
+        margin = self.overscan // 2
+        near_top = self._start > 0 and internal_top < margin
+        near_bottom = (self._start + count < total
+                       and internal_top + self._visible > count - margin)
+        too_small = last - first >= 1.0 and self._start + count < total
+
+        if (near_top or near_bottom or too_small) and not self._rewindow_pending:
+            self._rewindow_pending = True
+            self.after_idle(lambda: self.render(self._top))
+
+    def on_select(self, event=None):
+        """Remember selected rows by key so re-windowing keeps them selected"""
+        selection = self.tree.selection()
+        if selection == self._last_selection:
+            return
+        self._last_selection = selection
+        self._selected_keys = {self._item_keys[iid] for iid in selection if iid in self._item_keys}
@@ -0,0 +1,172 @@
+"""Headless attendance daemon.
+
+Runs the serial listeners, user lookup and attendance logging without any
+GUI, for door terminals and small single-board computers. Nothing here (or
+in the modules it imports) loads Tkinter or PIL.
+
+Run from the repository root:
+
+    python -m service.daemon --port /dev/ttyUSB0 --db attendance.db
+    python -m service.daemon --port /dev/ttyACM0=front --port /dev/ttyACM1=back
+    python -m service.daemon --all-ports "/dev/ttyACM*"
+"""
+import argparse
+import json
+import logging
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from arduino.sensor_manager import SensorManager
+from database.db_manager import DatabaseManager
+from service.pipeline import AttendancePipeline
+
+
+logger = logging.getLogger("attendance.daemon")
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+
+    # Attributes every LogRecord has; anything else was passed via ``extra``
+    RESERVED = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            'level': record.levelname.lower(),
+            'event': record.getMessage(),
+        }
+        entry.update({key: value for key, value in record.__dict__.items() if key not in self.RESERVED})
+        if record.exc_info:
+            entry['error'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class AttendanceDaemon:
+    """Connects to one or more sensors and logs every detection until stopped"""
+
+    def __init__(self, sensors: Dict[str, str], baudrate: int = 9600, db_path: str = "attendance.db",
+                 reconnect_interval: float = 5.0,
+                 debounce_window: float = AttendancePipeline.DEFAULT_DEBOUNCE_WINDOW):
+        # ``sensors`` maps sensor/door IDs to serial ports
+        self.db = DatabaseManager(db_path)
+        self.pipeline = AttendancePipeline(self.db, debounce_window)
+        self.sensors = SensorManager(self.on_fingerprint_detected, baudrate=baudrate,
+                                     reconnect_interval=reconnect_interval)
+        for sensor_id, port in sensors.items():
+            self.sensors.add_sensor(port, sensor_id)
+
+        self._stop_event = threading.Event()
+
+    def on_fingerprint_detected(self, sensor_id: str, fingerprint_id: int):
+        """Handle a detection on the sensor dispatcher thread"""
+        result = self.pipeline.handle_scan(fingerprint_id, sensor_id)
+        user = result['user']
+
+        if result['status'] == AttendancePipeline.DUPLICATE:
+            logger.debug("duplicate_scan", extra={
+                'sensor_id': sensor_id,
+                'fingerprint_id': fingerprint_id,
+                'suppressed': self.pipeline.debouncer.suppressed,
+            })
+        elif result['status'] == AttendancePipeline.GRANTED:
+            logger.info("access_granted", extra={
+                'sensor_id': sensor_id,
+                'fingerprint_id': fingerprint_id,
+                'user_id': user['id'],
+                'school_id': user['school_id'],
+                'queue_depth': self.db.get_attendance_queue_depth(),
+            })
+        else:
+            logger.warning("access_denied", extra={
+                'sensor_id': sensor_id,
+                'fingerprint_id': fingerprint_id,
+            })
+
+    def run(self):
+        """Run until stop() is called; SensorManager reconnects dropped sensors"""
+        logger.info("started", extra={'sensors': self.sensors.status(), 'db': self.db.db_path})
+        self.sensors.start()
+
+        connected = {}
+        while not self._stop_event.wait(1.0):
+            for sensor_id, state in self.sensors.status().items():
+                if state['connected'] != connected.get(sensor_id, False):
+                    connected[sensor_id] = state['connected']
+                    event = "connected" if state['connected'] else "connection_lost"
+                    logger.log(logging.INFO if state['connected'] else logging.WARNING, event,
+                               extra={'sensor_id': sensor_id, 'port': state['port']})
+
+        self.shutdown()
+
+    def stop(self, *args):
+        """Ask the run loop to exit; safe to use as a signal handler"""
+        self._stop_event.set()
+
+    def shutdown(self):
+        """Flush queued logs and release the ports and database"""
+        self.sensors.stop()
+        started = time.perf_counter()
+        self.db.close()
+        logger.info("stopped", extra={'dropped': self.sensors.dropped,
+                                      'debounce': self.pipeline.debouncer.stats(),
+                                      'flush_ms': round((time.perf_counter() - started) * 1000, 1)})
+
+
+def parse_sensors(ports: List[str]) -> Dict[str, str]:
+    """Turn PORT or PORT=SENSOR_ID arguments into a {sensor_id: port} dict"""
+    sensors = {}
+    for spec in ports:
+        port, _, sensor_id = spec.partition("=")
+        sensors[sensor_id or port] = port
+    return sensors
+
+
+def configure_logging(log_format: str, level: str, log_file: str = None):
+    handler = logging.FileHandler(log_file, encoding="utf-8") if log_file else logging.StreamHandler()
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the attendance system without a GUI")
+    parser.add_argument("--port", action="append", default=[], metavar="PORT[=SENSOR_ID]",
+                        help="serial port of an Arduino, optionally named; repeat for more sensors")
+    parser.add_argument("--all-ports", nargs="?", const="*", default=None, metavar="GLOB",
+                        help="also serve every available port matching GLOB (default: all)")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--db", default="attendance.db", help="path to the SQLite database")
+    parser.add_argument("--debounce", type=float, default=AttendancePipeline.DEFAULT_DEBOUNCE_WINDOW,
+                        help="ignore repeat scans of a fingerprint within this many seconds (0 disables)")
+    parser.add_argument("--log-format", choices=["json", "text"], default="json")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--log-file", default=None, help="write logs here instead of stderr")
+    args = parser.parse_args()
+
+    configure_logging(args.log_format, args.log_level, args.log_file)
+
+    sensors = parse_sensors(args.port)
+    if args.all_ports is not None:
+        for port in SensorManager.discover_ports(args.all_ports):
+            if port not in sensors.values():
+                sensors[port] = port
+    if not sensors:
+        sensors = {"COM4": "COM4"}
+
+    daemon = AttendanceDaemon(sensors, args.baudrate, args.db, debounce_window=args.debounce)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, Tuple
+
+
+class ScanDebouncer:
+    """Drops repeat scans of the same fingerprint inside a time window.
+
+    The sensor keeps reporting "ACCESS GRANTED" while a finger rests on it.
+    accept() lets the first scan of an ID through and rejects the same ID
+    until ``window`` seconds after that accepted scan. Accepted scans are
+    kept in a dict for O(1) lookups plus a deque in time order, so expired
+    entries are pruned from the front without scanning every ID.
+    """
+
+    def __init__(self, window: float = 10.0, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+
+        self.accepted = 0
+        self.suppressed = 0
+        self.suppressed_by_id: Counter = Counter()
+
+        self._last_accepted: Dict[int, float] = {}
+        self._timeline: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def accept(self, fingerprint_id: int) -> bool:
+        """Return True if this scan should be processed, False if it is a repeat"""
+        if self.window <= 0:
+            self.accepted += 1
+            return True
+
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+
+            if fingerprint_id in self._last_accepted:
+                self.suppressed += 1
+                self.suppressed_by_id[fingerprint_id] += 1
+                return False
+
+            self._last_accepted[fingerprint_id] = now
+            self._timeline.append((now, fingerprint_id))
+            self.accepted += 1
+            return True
+
+    def reset(self):
+        """Forget every recent scan, e.g. after the window is changed"""
+        with self._lock:
+            self._last_accepted.clear()
+            self._timeline.clear()
+
+    def stats(self) -> Dict:
+        """Counters for monitoring and the daemon's logs"""
+        return {
+            'window': self.window,
+            'tracked': len(self._last_accepted),
+            'accepted': self.accepted,
+            'suppressed': self.suppressed,
+        }
+
+    def _prune(self, now: float):
+        """Drop accepted scans older than the window"""
+        cutoff = now - self.window
+        while self._timeline and self._timeline[0][0] <= cutoff:
+            accepted_at, fingerprint_id = self._timeline.popleft()
+            if self._last_accepted.get(fingerprint_id) == accepted_at:
+                del self._last_accepted[fingerprint_id]
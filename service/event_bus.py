@@ -0,0 +1,48 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Published with the list of row dicts committed by write_attendance_batch
+ATTENDANCE_LOGGED = "attendance.logged"
+
+
+class EventBus:
+    """In-process publish/subscribe for events such as newly logged attendance.
+
+    publish() runs on whichever thread produced the event. Subscribers that
+    need a particular thread (Tk widgets) pass a ``dispatch`` function, e.g.
+    TkAsyncBridge.call_in_tk, which is called as ``dispatch(callback, payload)``.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Tuple[Callable, Optional[Callable]]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None],
+                  dispatch: Optional[Callable] = None) -> Callable[[], None]:
+        """Register a callback for a topic; returns a function that unsubscribes it"""
+        entry = (callback, dispatch)
+        with self._lock:
+            self._subscribers[topic].append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers[topic]:
+                    self._subscribers[topic].remove(entry)
+
+        return unsubscribe
+
+    def publish(self, topic: str, payload: Any = None):
+        """Deliver a payload to every subscriber of the topic"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+
+        for callback, dispatch in subscribers:
+            try:
+                if dispatch:
+                    dispatch(callback, payload)
+                else:
+                    callback(payload)
+            except Exception as e:
+                print(f"Error in {topic} subscriber: {e}")
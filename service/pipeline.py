@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+
+from service.debounce import ScanDebouncer
+
+
+class AttendancePipeline:
+    """Turns fingerprint detections into attendance logs.
+
+    Shared by the GUI and the headless daemon, so it must not import Tk.
+    handle_scan() looks the user up in DatabaseManager's in-memory cache and
+    queues the log for the background writer, so it never waits on the disk.
+    Repeat scans of the same fingerprint within ``debounce_window`` seconds
+    are dropped first; pass 0 to log every scan.
+    """
+
+    GRANTED = "granted"
+    DENIED = "denied"
+    DUPLICATE = "duplicate"
+
+    DEFAULT_DEBOUNCE_WINDOW = 10.0
+
+    def __init__(self, db, debounce_window: float = DEFAULT_DEBOUNCE_WINDOW):
+        self.db = db
+        self.debouncer = ScanDebouncer(debounce_window)
+
+    def handle_scan(self, fingerprint_id: int, sensor_id: Optional[str] = None) -> Dict:
+        """Process one detection and return what happened.
+
+        The result has the scan ``status`` (GRANTED, DENIED or DUPLICATE),
+        the ``fingerprint_id``, the ``sensor_id`` that reported it and the
+        matched ``user`` dict, or None. Duplicates are not looked up.
+        """
+        if not self.debouncer.accept(fingerprint_id):
+            return {
+                'status': self.DUPLICATE,
+                'fingerprint_id': fingerprint_id,
+                'sensor_id': sensor_id,
+                'user': None
+            }
+
+        user: Optional[Dict] = self.db.get_user_by_fingerprint(fingerprint_id)
+
+        if user:
+            self.db.log_attendance_async(user['id'], sensor_id)
+            status = self.GRANTED
+        else:
+            status = self.DENIED
+
+        return {
+            'status': status,
+            'fingerprint_id': fingerprint_id,
+            'sensor_id': sensor_id,
+            'user': user
+        }
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class DeleteAttendanceRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.tmp.name, "attendance.db"))
+        self.db.add_user(1, "Ana", "S1")
+        self.db.load_user_cache()
+        user_id = self.db.get_user_by_fingerprint(1)['id']
+        self.db.write_attendance_batch([(user_id, "2025-01-10 08:00:00", None),
+                                        (user_id, "2025-02-10 08:00:00", None)])
+        self.db.archive_logs("2025-02")
+        self.archived_id, self.live_id = (log['id'] for log in sorted(
+            self.db.get_attendance_logs(), key=lambda log: log['timestamp']))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_live_record_is_deleted(self):
+        self.assertFalse(self.db.is_archived_record(self.live_id))
+        self.assertTrue(self.db.delete_attendance_record(self.live_id))
+        self.assertIsNone(self.db.get_attendance_record(self.live_id))
+        self.assertEqual(self.db.get_daily_summary("2025-02-10")['total_scans'], 0)
+
+    def test_archived_record_is_read_only(self):
+        self.assertTrue(self.db.is_archived_record(self.archived_id))
+        self.assertFalse(self.db.delete_attendance_record(self.archived_id))
+        self.assertIsNotNone(self.db.get_attendance_record(self.archived_id))
+        self.assertEqual(self.db.get_daily_summary("2025-01-10")['total_scans'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class ArchiveDirTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "attendance.db")
+
+        db = DatabaseManager(self.db_path)
+        try:
+            db.add_user(1, "Ana", "S1")
+            db.load_user_cache()
+            db.write_attendance_batch([(db.get_user_by_fingerprint(1)['id'], timestamp, None)
+                                       for timestamp in ("2025-01-10 08:00:00", "2025-02-10 08:00:00")])
+        finally:
+            db.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_default_manager_reads_archive_made_with_custom_dir(self):
+        archive_dir = os.path.join(self.tmp.name, "elsewhere")
+        db = DatabaseManager(self.db_path, archive_dir=archive_dir)
+        try:
+            results = db.archive_logs("2025-02")
+        finally:
+            db.close()
+        self.assertEqual([result['moved'] for result in results], [1])
+        self.assertTrue(results[0]['path'].startswith(archive_dir))
+
+        db = DatabaseManager(self.db_path)
+        try:
+            timestamps = [log['timestamp'] for log in db.get_attendance_logs()]
+            rows, _ = db.get_attendance_page()
+        finally:
+            db.close()
+        self.assertEqual(timestamps, ["2025-02-10 08:00:00", "2025-01-10 08:00:00"])
+        self.assertEqual(len(rows), 2)
+
+    def test_rearchiving_with_default_dir_keeps_custom_archive_rows(self):
+        db = DatabaseManager(self.db_path, archive_dir=os.path.join(self.tmp.name, "elsewhere"))
+        try:
+            db.archive_logs("2025-02")
+            db.write_attendance_batch([(db.get_user_by_fingerprint(1)['id'], "2025-01-20 08:00:00", None)])
+        finally:
+            db.close()
+
+        db = DatabaseManager(self.db_path)
+        try:
+            results = db.archive_logs("2025-02")
+            partitions = db.get_partitions()
+        finally:
+            db.close()
+        self.assertEqual(results[0]['row_count'], 2)
+        self.assertEqual(partitions[0]['row_count'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()